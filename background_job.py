@@ -0,0 +1,108 @@
+# ============================================
+# Background Jobs
+# Chunked, cancellable, CPU-capped batch work for unified_app.py
+# ============================================
+# A job walks rows [0, total) in fixed-size chunks on a daemon thread and
+# calls work(start, stop) for each. Between chunks it checks for cancellation
+# and sleeps long enough that the thread's CPU time stays within cpu_share of
+# wall time, so request threads keep most of the CPU (and the GIL) while a
+# long job runs.
+
+import threading
+import time
+import uuid
+
+
+class BackgroundJob:
+    """One run of a chunked batch job with progress and cancellation"""
+
+    def __init__(self, name, total, work, finish=None, chunk_size=5000, cpu_share=0.25, params=None):
+        self.id = str(uuid.uuid4())
+        self.name = name
+        self.total = total
+        self.work = work
+        self.finish = finish
+        self.chunk_size = max(1, int(chunk_size))
+        self.cpu_share = min(1.0, max(0.01, float(cpu_share)))
+        self.params = params or {}
+
+        self.status = 'running'
+        self.processed = 0
+        self.changed = 0
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.cpu_seconds = 0.0
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f'job-{name}', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the job to stop after the chunk in progress"""
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return self.status == 'running'
+
+    def _run(self):
+        # The terminal status is set only after finish() returns, so callers that
+        # check `running` cannot start a new job while cleanup is still writing
+        status = 'running'
+        try:
+            for start in range(0, self.total, self.chunk_size):
+                if self.cancel_event.is_set():
+                    break
+                stop = min(start + self.chunk_size, self.total)
+                wall_started = time.perf_counter()
+                cpu_started = time.thread_time()
+                self.changed += self.work(start, stop)
+                cpu = time.thread_time() - cpu_started
+                self.cpu_seconds += cpu
+                self.processed = stop
+                # Duty cycle: idle until this chunk's CPU time is cpu_share of the elapsed time
+                idle = cpu / self.cpu_share - (time.perf_counter() - wall_started)
+                if idle > 0:
+                    self.cancel_event.wait(idle)
+            status = 'cancelled' if self.cancel_event.is_set() and self.processed < self.total else 'completed'
+        except Exception as e:
+            print(f'❌ Job {self.name} failed: {e}')
+            self.error = str(e)
+            status = 'failed'
+        finally:
+            if self.finish is not None:
+                try:
+                    self.finish(self)
+                except Exception as e:
+                    print(f'❌ Job {self.name} cleanup failed: {e}')
+                    self.error = self.error or f'cleanup failed: {e}'
+                    status = 'failed'
+            self.finished_at = time.time()
+            self.status = status
+
+    def progress(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.processed
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'params': self.params,
+            'processed': self.processed,
+            'total': self.total,
+            'percent': round(100.0 * self.processed / self.total, 2) if self.total else 100.0,
+            'changed': self.changed,
+            'rows_per_second': round(rate, 1),
+            'eta_seconds': round(remaining / rate, 1) if self.running and rate > 0 else None,
+            'elapsed_seconds': round(elapsed, 3),
+            'cpu_seconds': round(self.cpu_seconds, 3),
+            'cpu_share': self.cpu_share,
+            'cancel_requested': self.cancel_event.is_set(),
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
@@ -41,21 +41,22 @@ const History = () => {
   const [selectedPrediction, setSelectedPrediction] = useState(null);
 
   useEffect(() => {
-    fetchHistory();
-    fetchAnalytics();
+    fetchDashboard();
   }, []);
 
   // Use relative URLs for unified deployment
   // In production, frontend and backend are served from the same domain
   const API_URL = process.env.NODE_ENV === 'production' ? '' : (process.env.REACT_APP_API_URL || 'http://localhost:5000');
 
-  const fetchHistory = async () => {
+  // History and analytics come from one precomputed payload
+  const fetchDashboard = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_URL}/api/history`, {
+      const response = await axios.get(`${API_URL}/api/dashboard`, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setHistory(response.data.data);
+      setHistory(response.data.data.history);
+      setAnalytics(response.data.data.analytics);
     } catch (err) {
       setError('Failed to load history');
     } finally {
@@ -63,18 +64,6 @@ const History = () => {
     }
   };
 
-  const fetchAnalytics = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_URL}/api/analytics`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setAnalytics(response.data.data);
-    } catch (err) {
-      console.error('Failed to load analytics');
-    }
-  };
-
   const deletePrediction = async (id) => {
     if (!window.confirm('Are you sure you want to delete this prediction?')) {
       return;
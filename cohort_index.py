@@ -0,0 +1,167 @@
+# ============================================
+# Cohort Index
+# Percentile ranks and top-k leaderboards over all predictions
+# ============================================
+# Scores live on a fixed 0-100 scale, so each metric is kept as a Fenwick
+# tree over fixed-width bins: updates and rank queries are O(log bins) and
+# memory does not grow with the number of predictions.
+
+import bisect
+import threading
+
+import numpy as np
+
+
+class FenwickHistogram:
+    """Fixed-bin histogram with O(log n) insert and prefix counts"""
+
+    def __init__(self, low=0.0, high=100.0, resolution=0.01):
+        self.low = low
+        self.resolution = resolution
+        self.size = int(round((high - low) / resolution)) + 1
+        self.tree = [0] * (self.size + 1)
+        self.total = 0
+
+    def _bin(self, value):
+        index = int(round((value - self.low) / self.resolution))
+        return min(max(index, 0), self.size - 1)
+
+    def add(self, value, count=1):
+        i = self._bin(value) + 1
+        while i <= self.size:
+            self.tree[i] += count
+            i += i & -i
+        self.total += count
+
+    def load(self, values):
+        """Replace the contents with a bulk set of values in O(n + bins)"""
+        bins = np.clip(np.rint((np.asarray(values, dtype=np.float64) - self.low) / self.resolution),
+                       0, self.size - 1).astype(np.int64)
+        tree = [0] + np.bincount(bins, minlength=self.size).tolist()
+        # Standard linear-time Fenwick construction
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = len(bins)
+
+    def count_below(self, bin_index):
+        """Number of values in bins strictly below bin_index"""
+        i = bin_index
+        result = 0
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def percentile(self, value):
+        """Percentile rank of value (ties count half)"""
+        if self.total == 0:
+            return 0.0
+        b = self._bin(value)
+        below = self.count_below(b)
+        equal = self.count_below(b + 1) - below
+        return (below + 0.5 * equal) / self.total * 100
+
+
+class Leaderboard:
+    """
+    Top-k users by their best value
+    A user's best only ever increases, so keeping the k largest
+    (value, user) pairs in a sorted list is exact
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.best = {}
+        self.top = []  # ascending (value, user_id)
+
+    def update(self, user_id, value):
+        previous = self.best.get(user_id)
+        if previous is not None and value <= previous:
+            return
+        self.best[user_id] = value
+
+        if previous is not None:
+            i = bisect.bisect_left(self.top, (previous, user_id))
+            if i < len(self.top) and self.top[i] == (previous, user_id):
+                self.top.pop(i)
+
+        if len(self.top) < self.capacity or (value, user_id) > self.top[0]:
+            bisect.insort(self.top, (value, user_id))
+            if len(self.top) > self.capacity:
+                self.top.pop(0)
+
+    def load(self, best):
+        """Replace the contents with a user_id -> best value mapping"""
+        self.best = dict(best)
+        self.top = sorted((v, u) for u, v in self.best.items())[-self.capacity:]
+
+    def top_k(self, k):
+        return [(user_id, value) for value, user_id in reversed(self.top[-k:])] if k > 0 else []
+
+
+class CohortIndex:
+    """Incrementally maintained cohort statistics for each tracked metric"""
+
+    def __init__(self, metrics, leaderboard_size=100):
+        self.metrics = list(metrics)
+        self.histograms = {m: FenwickHistogram() for m in self.metrics}
+        self.leaderboards = {m: Leaderboard(leaderboard_size) for m in self.metrics}
+        self.latest = {}
+        self.lock = threading.Lock()
+
+    def add(self, user_id, values):
+        """Record one prediction's metric values"""
+        with self.lock:
+            for metric in self.metrics:
+                self.histograms[metric].add(values[metric])
+                self.leaderboards[metric].update(user_id, values[metric])
+            self.latest[user_id] = {m: values[m] for m in self.metrics}
+
+    def rebuild(self, user_ids, user_column, metric_columns):
+        """
+        Bulk-load from columnar predictions (e.g. after restoring a snapshot)
+        user_column holds indexes into user_ids, one per prediction in insertion order
+        """
+        user_column = np.asarray(user_column)
+        n_users = len(user_ids)
+        # Last occurrence of each user is their latest prediction
+        last_row = np.full(n_users, -1, dtype=np.int64)
+        np.maximum.at(last_row, user_column, np.arange(len(user_column)))
+        with self.lock:
+            for metric in self.metrics:
+                values = np.asarray(metric_columns[metric], dtype=np.float64)
+                self.histograms[metric].load(values)
+                best = np.full(n_users, -np.inf)
+                np.maximum.at(best, user_column, values)
+                self.leaderboards[metric].load({
+                    user_ids[u]: round(float(best[u]), 2) for u in np.flatnonzero(last_row >= 0)
+                })
+            self.latest = {
+                user_ids[u]: {m: round(float(metric_columns[m][last_row[u]]), 2) for m in self.metrics}
+                for u in np.flatnonzero(last_row >= 0)
+            }
+
+    def percentiles(self, user_id):
+        """Percentile of the user's latest prediction among all predictions"""
+        with self.lock:
+            latest = self.latest.get(user_id)
+            if latest is None:
+                return None
+            return {
+                metric: {
+                    'value': latest[metric],
+                    'percentile': round(self.histograms[metric].percentile(latest[metric]), 2)
+                }
+                for metric in self.metrics
+            }
+
+    def top_k(self, metric, k):
+        with self.lock:
+            return self.leaderboards[metric].top_k(k)
+
+    @property
+    def total(self):
+        return self.histograms[self.metrics[0]].total if self.metrics else 0
@@ -0,0 +1,30 @@
+"""
+Access control for admin-only endpoints
+Callers send the ADMIN_TOKEN value in the X-Admin-Token header; when no
+ADMIN_TOKEN is configured the admin endpoints are disabled
+"""
+
+import functools
+import hmac
+import os
+
+from flask import jsonify, request
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+
+def is_admin():
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode())
+
+
+def admin_required(view):
+    """Reject the request with 403 unless it carries the admin token"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({'error': 'Admin endpoints are disabled (ADMIN_TOKEN is not set)'}), 403
+        if not is_admin():
+            return jsonify({'error': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
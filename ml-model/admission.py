@@ -0,0 +1,160 @@
+"""
+Admission control for the prediction endpoints
+Per-client and global token buckets plus a cap on in-flight requests, so
+traffic spikes are shed quickly with 429/503 instead of queueing until timeout
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+
+# ============================================
+# SETTINGS (0 disables a limit)
+# ============================================
+GLOBAL_RATE = float(os.environ.get('ADMISSION_GLOBAL_RATE', 200))
+GLOBAL_BURST = float(os.environ.get('ADMISSION_GLOBAL_BURST', 400))
+KEY_RATE = float(os.environ.get('ADMISSION_KEY_RATE', 5))
+KEY_BURST = float(os.environ.get('ADMISSION_KEY_BURST', 20))
+MAX_IN_FLIGHT = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', 32))
+# Per-client buckets kept before the least recently used is evicted
+MAX_KEYS = int(os.environ.get('ADMISSION_MAX_KEYS', 10000))
+# Reverse proxies in front of the app that append to X-Forwarded-For (0 = trust none)
+PROXY_HOPS = int(os.environ.get('ADMISSION_PROXY_HOPS', 0))
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Take one token; returns 0 on success, else seconds until one is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Decides whether a request may enter a guarded endpoint"""
+
+    def __init__(self, global_rate=GLOBAL_RATE, global_burst=GLOBAL_BURST,
+                 key_rate=KEY_RATE, key_burst=KEY_BURST,
+                 max_in_flight=MAX_IN_FLIGHT, max_keys=MAX_KEYS):
+        self.global_bucket = TokenBucket(global_rate, global_burst) if global_rate > 0 else None
+        self.key_rate = key_rate
+        self.key_burst = key_burst
+        self.max_keys = max_keys
+        self.key_buckets = OrderedDict()
+        self.keys_lock = threading.Lock()
+        self.max_in_flight = max_in_flight
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+
+        self.counters = {
+            'admitted': 0,
+            'shed_client_rate': 0,
+            'shed_global_rate': 0,
+            'shed_in_flight': 0
+        }
+        self.counters_lock = threading.Lock()
+
+    def _count(self, name):
+        with self.counters_lock:
+            self.counters[name] += 1
+
+    def _key_bucket(self, key):
+        with self.keys_lock:
+            bucket = self.key_buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.key_rate, self.key_burst)
+                self.key_buckets[key] = bucket
+                if len(self.key_buckets) > self.max_keys:
+                    self.key_buckets.popitem(last=False)
+            else:
+                self.key_buckets.move_to_end(key)
+            return bucket
+
+    def admit(self, key):
+        """
+        Try to admit a request
+        Returns (status, retry_after): status is None when admitted,
+        otherwise the HTTP status to shed with
+        """
+        if self.key_rate > 0:
+            wait = self._key_bucket(key).take()
+            if wait:
+                self._count('shed_client_rate')
+                return 429, wait
+
+        if self.global_bucket is not None:
+            wait = self.global_bucket.take()
+            if wait:
+                self._count('shed_global_rate')
+                return 503, wait
+
+        if self.in_flight is not None and not self.in_flight.acquire(blocking=False):
+            self._count('shed_in_flight')
+            return 503, 1
+
+        self._count('admitted')
+        return None, 0
+
+    def release(self):
+        if self.in_flight is not None:
+            self.in_flight.release()
+
+    def guard(self, key_func):
+        """Decorator applying admission control to a Flask view"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                status, retry_after = self.admit(key_func())
+                if status is not None:
+                    message = 'Too many requests' if status == 429 else 'Server busy, please retry'
+                    return jsonify({'error': message}), status, {
+                        'Retry-After': str(max(1, math.ceil(retry_after)))
+                    }
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    self.release()
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self.counters_lock:
+            counters = dict(self.counters)
+        counters['shed_total'] = (counters['shed_client_rate'] +
+                                  counters['shed_global_rate'] +
+                                  counters['shed_in_flight'])
+        counters['tracked_clients'] = len(self.key_buckets)
+        return counters
+
+
+def client_key():
+    """
+    Identify the caller by address
+    Bearer tokens are not used here because they are unverified at this point:
+    a fresh random token per request would get a fresh bucket. X-Forwarded-For
+    is only read behind PROXY_HOPS trusted proxies, taking the address the
+    outermost of them saw, since clients can put anything in the header
+    """
+    if PROXY_HOPS > 0:
+        forwarded = [a.strip() for a in request.headers.get('X-Forwarded-For', '').split(',') if a.strip()]
+        if len(forwarded) >= PROXY_HOPS:
+            return forwarded[-PROXY_HOPS]
+    return request.remote_addr or ''
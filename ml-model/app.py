@@ -10,10 +10,26 @@ import joblib
 import numpy as np
 import pandas as pd
 import os
+from admission import AdmissionController, client_key
+from singleflight import SingleFlight
+from drift import DriftMonitor
+from inference_pool import InferencePool, PoolSaturated, build_tables, score_matrix, ROW_LOGIT
+from scoring_rules import ScoringRules
+from tracing import RequestTracer
+from admin import admin_required
+from model_registry import ModelRegistry, ModelBundle, TENANT_HEADER, load_bundle
+from shadow import ShadowEvaluator, SHADOW_MODEL_DIR
 
 app = Flask(__name__)
 CORS(app)
 
+# Load shedding in front of the prediction endpoints (see admission.py)
+admission = AdmissionController()
+# Identical /predict profiles in flight share one computation
+coalescer = SingleFlight()
+# Recent and slowest requests with stage timings, served by /debug/slow
+tracer = RequestTracer().init_app(app)
+
 # Load model and scaler
 MODEL_PATH = 'placement_model.joblib'
 SCALER_PATH = 'scaler.joblib'
@@ -42,66 +58,91 @@ FEATURE_LABELS = {
 }
 
 # ============================================
-# IDEAL SKILL VALUES FOR GAP ANALYSIS
+# SCORING RULES (ideals, scales, readiness weights, tiers)
 # ============================================
-IDEAL_SKILLS = {
-    'dsa_score': 70,
-    'communication': 7,
-    'projects': 3,
-    'cgpa': 7.5,
-    'internships': 2
-}
+# Shared with unified_app.py through scoring_rules.json
+scoring_rules = ScoringRules.load()
+if scoring_rules.features != FEATURE_NAMES:
+    raise RuntimeError(f"Scoring rules features {scoring_rules.features} do not match the model's {FEATURE_NAMES}")
+
+# Ideal skill values for gap analysis
+IDEAL_SKILLS = scoring_rules.ideals()
 
 # Maximum possible values for percentage calculation
-SKILL_MAX = {
-    'cgpa': 10,
-    'dsa_score': 100,
-    'projects': 6,
-    'communication': 10,
-    'internships': 4
-}
+SKILL_MAX = scoring_rules.scales()
+
+# Live input distributions compared against the training data
+DATASET_PATH = 'dataset.csv'
+drift_monitor = DriftMonitor(FEATURE_NAMES, DATASET_PATH if os.path.exists(DATASET_PATH) else None)
+
+# Shared scoring tables for batch inference (see inference_pool.py)
+inference_pool = InferencePool(build_tables(model, scaler, scoring_rules))
+
+# Per-tenant models picked by the X-Tenant-ID header, loaded on first use
+# (see model_registry.py); requests without a tenant model use the one above
+model_registry = ModelRegistry(ModelBundle(model, scaler, scoring_rules), len(FEATURE_NAMES))
+
+# Candidate model scored against the default one on sampled /predict traffic,
+# on a background thread (see shadow.py); enabled by SHADOW_MODEL_DIR
+shadow = None
+if SHADOW_MODEL_DIR:
+    try:
+        candidate = load_bundle(SHADOW_MODEL_DIR, len(FEATURE_NAMES))
+        shadow = ShadowEvaluator(model_registry.default, candidate, scoring_rules, name=SHADOW_MODEL_DIR)
+    except Exception as e:
+        print(f"⚠️ Shadow evaluation disabled, candidate did not load: {e}")
+
+def tenant_bundle():
+    """Model bundle for the tenant named in the request headers"""
+    return model_registry.get(request.headers.get(TENANT_HEADER))
+
+def scoring_table(bundle):
+    """Scoring table for a bundle; the default model's lives in the inference pool"""
+    return inference_pool.table if bundle is model_registry.default else bundle.table
 
 # ============================================
 # 1. PLACEMENT READINESS SCORE CALCULATOR
 # ============================================
-def calculate_readiness_score(data):
+def score_profile(data, probability=None):
+    """
+    Evaluate the scoring rules for one profile
+    probability (0-1) also resolves the tiers that depend on the model
+    """
+    return scoring_rules.evaluate(
+        scoring_rules.matrix(data),
+        None if probability is None else [probability * 100]
+    )
+
+def calculate_readiness_score(data, scoring=None):
     """
     Calculate advanced placement readiness score
-    Formula: (cgpa * 10 + dsa_score + communication + projects*5 + internships*5) / 5
+    Weighted sum of each feature's share of its scale (see scoring_rules.json)
     """
-    cgpa = data.get('cgpa', 0)
-    dsa_score = data.get('dsa_score', 0)
-    communication = data.get('communication', 0)
-    projects = data.get('projects', 0)
-    internships = data.get('internships', 0)
-    
-    # Calculate raw readiness score
-    raw_score = (cgpa * 10 + dsa_score + communication + projects * 5 + internships * 5) / 5
-    
-    # Normalize to 0-100 scale
-    # Max possible: (10*10 + 100 + 10 + 6*5 + 4*5) / 5 = (100 + 100 + 10 + 30 + 20) / 5 = 260/5 = 52
-    # So we normalize by dividing by 52 and multiplying by 100
-    max_possible = 52
-    normalized_score = min(100, (raw_score / max_possible) * 100)
-    
-    return round(normalized_score, 2)
+    if scoring is None:
+        scoring = score_profile(data)
+    return round(float(scoring['readiness_score'][0]), 2)
 
 # ============================================
 # 2. SKILL GAP ANALYZER
 # ============================================
-def analyze_skill_gaps(data):
+def analyze_skill_gaps(data, scoring=None):
     """
     Analyze skill gaps by comparing user scores with ideal values
     Returns list of weak skills and gap details
     """
+    if scoring is None:
+        scoring = score_profile(data)
+    weak = scoring['weak'][0]
+    gap_pct = scoring['gap_pct'][0]
+    severity = scoring['gap_severity'][0]
+    
     weak_skills = []
     skill_gaps = []
     
-    for skill, ideal_value in IDEAL_SKILLS.items():
-        user_value = data.get(skill, 0)
-        
-        if user_value < ideal_value:
-            gap_percentage = ((ideal_value - user_value) / ideal_value) * 100
+    for i, skill in enumerate(FEATURE_NAMES):
+        if weak[i]:
+            user_value = data.get(skill, 0)
+            ideal_value = IDEAL_SKILLS[skill]
             weak_skills.append(FEATURE_LABELS.get(skill, skill))
             skill_gaps.append({
                 'skill': FEATURE_LABELS.get(skill, skill),
@@ -109,8 +150,8 @@ def analyze_skill_gaps(data):
                 'current': user_value,
                 'ideal': ideal_value,
                 'gap': ideal_value - user_value,
-                'gap_percentage': round(gap_percentage, 1),
-                'severity': 'High' if gap_percentage > 30 else 'Medium' if gap_percentage > 15 else 'Low'
+                'gap_percentage': round(float(gap_pct[i]), 1),
+                'severity': scoring_rules.tiers['gap_severity'].level(severity[i])['severity']
             })
     
     # Sort by gap percentage (highest first)
@@ -260,34 +301,12 @@ def generate_recommendations(skill_gaps, readiness_score):
 # ============================================
 # PRO FEATURE: AI RECOMMENDATION ENGINE
 # ============================================
-def get_recommendation_level(probability):
+def get_recommendation_level(scoring):
     """
     Determine recommendation level based on placement probability
+    Thresholds and wording come from scoring_rules.json
     """
-    if probability < 0.5:
-        return {
-            'level': 'High Risk',
-            'color': '#f87171',
-            'icon': '⚠️',
-            'message': 'Immediate action required. Focus on skill improvement.',
-            'urgency': 'Critical'
-        }
-    elif probability <= 0.75:
-        return {
-            'level': 'Moderate',
-            'color': '#fbbf24',
-            'icon': '📈',
-            'message': 'Good potential. Targeted improvements needed.',
-            'urgency': 'Medium'
-        }
-    else:
-        return {
-            'level': 'Strong Candidate',
-            'color': '#4ade80',
-            'icon': '🎯',
-            'message': 'Excellent profile. Focus on interview preparation.',
-            'urgency': 'Low'
-        }
+    return scoring_rules.level('recommendation_level', scoring)
 
 def generate_ai_recommendations(skill_gaps, probability, readiness_score):
     """
@@ -331,28 +350,41 @@ def generate_ai_recommendations(skill_gaps, probability, readiness_score):
     
     return ai_recommendations[:6]  # Return top 6 recommendations
 
-def identify_skill_insights(data, skill_scores):
+# ============================================
+# MODEL EXPLANATIONS
+# ============================================
+def explain_contributions(features_scaled, model):
+    """
+    Each feature's contribution to the logit (coef x scaled value)
+    Works on one row or a whole batch in a single vectorized operation;
+    the logit is the model intercept plus the row sum
+    """
+    return np.asarray(features_scaled) * model.coef_[0]
+
+def format_explanation(contributions, model):
+    """Explanation payload for one row of contributions"""
+    order = np.argsort(-contributions, kind='stable')
+    return {
+        'baseline_logit': round(float(model.intercept_[0]), 4),
+        'contributions': {f: round(float(c), 4) for f, c in zip(FEATURE_NAMES, contributions)},
+        'ranked': [FEATURE_LABELS[FEATURE_NAMES[i]] for i in order]
+    }
+
+def identify_skill_insights(skill_scores, contributions, scoring):
     """
     Identify strongest and weakest skills
+    Strongest/weakest are the features that raise/lower the model's logit the most
     """
     # Find strongest skill
-    strongest_skill = max(skill_scores, key=skill_scores.get)
+    strongest_skill = FEATURE_NAMES[int(np.argmax(contributions))]
     strongest_score = skill_scores[strongest_skill]
     
     # Find weakest skill
-    weakest_skill = min(skill_scores, key=skill_scores.get)
+    weakest_skill = FEATURE_NAMES[int(np.argmin(contributions))]
     weakest_score = skill_scores[weakest_skill]
     
     # Determine placement category
-    avg_score = sum(skill_scores.values()) / len(skill_scores)
-    if avg_score >= 75:
-        placement_category = "Tier-1 Companies"
-    elif avg_score >= 60:
-        placement_category = "Tier-2 Companies"
-    elif avg_score >= 45:
-        placement_category = "Startups & Mid-size"
-    else:
-        placement_category = "Needs Significant Improvement"
+    placement_category = scoring_rules.level('placement_category', scoring)['label']
     
     return {
         'strongest_skill': FEATURE_LABELS.get(strongest_skill, strongest_skill),
@@ -362,6 +394,152 @@ def identify_skill_insights(data, skill_scores):
         'placement_category': placement_category
     }
 
+# ============================================
+# WHAT-IF / COUNTERFACTUAL ANALYSIS
+# ============================================
+# Step size per feature for the perturbation grid
+WHATIF_STEPS = {
+    'cgpa': 0.5,
+    'dsa_score': 5,
+    'projects': 1,
+    'communication': 1,
+    'internships': 1
+}
+# Features that only take whole-number values
+INTEGER_FEATURES = {'dsa_score', 'projects', 'communication', 'internships'}
+WHATIF_DEFAULT_STEPS = 4
+WHATIF_MAX_STEPS = 20
+WHATIF_MAX_GRID_POINTS = 100000
+
+def minimal_feature_changes(features, target_probability, table):
+    """
+    Closed-form minimal change per feature to reach the target probability
+    Solves bias + w . x + w_j * delta_j = logit(target) for each feature on its own
+    """
+    bias = table[ROW_LOGIT, 0]
+    weights = table[ROW_LOGIT, 1:]
+    current_logit = bias + float(np.dot(weights, features))
+    target_logit = np.log(target_probability / (1 - target_probability))
+    
+    changes = {}
+    for i, feature in enumerate(FEATURE_NAMES):
+        current = float(features[i])
+        if current_logit >= target_logit:
+            required = current
+        elif weights[i] > 0:
+            required = current + float((target_logit - current_logit) / weights[i])
+            # Round up so the reported value actually reaches the target
+            if feature in INTEGER_FEATURES:
+                required = float(np.ceil(required - 1e-9))
+            else:
+                required = float(np.ceil(required * 100 - 1e-9) / 100)
+        else:
+            required = None
+        
+        reachable = bool(required is not None and required <= SKILL_MAX[feature])
+        changes[feature] = {
+            'label': FEATURE_LABELS[feature],
+            'current': current,
+            'required': round(required, 2) if reachable else None,
+            'change': round(required - current, 2) if reachable else None,
+            'reachable': reachable
+        }
+    return changes
+
+def build_whatif_grid(features, steps, overrides):
+    """Cartesian grid of non-negative perturbations around a profile"""
+    axes = []
+    for i, feature in enumerate(FEATURE_NAMES):
+        if feature in overrides:
+            values = np.asarray(overrides[feature], dtype=np.float64)
+        else:
+            values = features[i] + WHATIF_STEPS[feature] * np.arange(steps + 1)
+        values = np.unique(np.clip(values, 0, SKILL_MAX[feature]))
+        axes.append(values)
+    return axes
+
+@app.route('/whatif', methods=['POST'])
+@admission.guard(client_key)
+def whatif():
+    """
+    What-if analysis around a profile in one vectorized pass
+    Body: {cgpa, dsa_score, projects, communication, internships,
+           target_probability (0-1 or 0-100, default 0.8), steps (1-20), grid: {feature: [values]}}
+    Returns the grid of probabilities and the minimal change per feature to reach the target
+    """
+    try:
+        data = request.get_json()
+        
+        for field in FEATURE_NAMES:
+            if field not in data:
+                return jsonify({"error": f"Missing field: {field}"}), 400
+        
+        target = float(data.get('target_probability', 0.8))
+        if target > 1:
+            target /= 100
+        if not 0 < target < 1:
+            return jsonify({"error": "target_probability must be between 0 and 1"}), 400
+        
+        # Steps along each axis; clamped so the grid is never allocated oversized
+        try:
+            steps = min(max(int(data.get('steps', WHATIF_DEFAULT_STEPS)), 1), WHATIF_MAX_STEPS)
+        except (TypeError, ValueError, OverflowError):
+            return jsonify({"error": "steps must be an integer"}), 400
+        overrides = data.get('grid') or {}
+        if not isinstance(overrides, dict):
+            return jsonify({"error": "grid must map feature names to lists of values"}), 400
+        for feature, values in overrides.items():
+            if feature not in FEATURE_NAMES:
+                return jsonify({"error": f"Unknown grid feature: {feature}"}), 400
+            if not isinstance(values, list) or not values or len(values) > WHATIF_MAX_GRID_POINTS:
+                return jsonify({"error": f"grid.{feature} must be a non-empty list of at most {WHATIF_MAX_GRID_POINTS} values"}), 400
+        features = np.array([float(data[f]) for f in FEATURE_NAMES])
+        
+        axes = build_whatif_grid(features, steps, overrides)
+        shape = tuple(len(a) for a in axes)
+        n_points = int(np.prod(shape))
+        if n_points > WHATIF_MAX_GRID_POINTS:
+            return jsonify({"error": f"Grid too large: {n_points} points (max {WHATIF_MAX_GRID_POINTS})"}), 400
+        
+        mesh = np.meshgrid(*axes, indexing='ij')
+        grid = np.stack([m.ravel() for m in mesh], axis=1)
+        with tracer.stage('model'):
+            bundle = tenant_bundle()
+            table = scoring_table(bundle)
+        with tracer.stage('score_grid'):
+            probability, readiness, _, _ = score_matrix(table, np.vstack([features, grid]))
+        current_probability = probability[0]
+        probability, readiness = probability[1:], readiness[1:]
+        
+        # Cheapest grid points reaching the target, by total change relative to each feature's range
+        skill_max = np.array([SKILL_MAX[f] for f in FEATURE_NAMES])
+        effort = (np.abs(grid - features) / skill_max).sum(axis=1)
+        reaching = np.flatnonzero(probability >= target)
+        best = reaching[np.argsort(effort[reaching], kind='stable')[:5]]
+        
+        return jsonify({
+            "status": "success",
+            "model": bundle.name,
+            "current_probability": round(float(current_probability) * 100, 2),
+            "target_probability": round(target * 100, 2),
+            "minimal_changes": minimal_feature_changes(features, target, table),
+            "best_options": [{
+                "profile": {f: float(v) for f, v in zip(FEATURE_NAMES, grid[i])},
+                "placement_probability": round(float(probability[i]) * 100, 2),
+                "readiness_score": round(float(readiness[i]), 2)
+            } for i in best],
+            "grid": {
+                "features": FEATURE_NAMES,
+                "values": {f: a.tolist() for f, a in zip(FEATURE_NAMES, axes)},
+                "shape": list(shape),
+                "placement_probability": np.round(probability * 100, 2).tolist(),
+                "points_reaching_target": int(len(reaching))
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # ============================================
 # API ENDPOINTS
 # ============================================
@@ -373,15 +551,156 @@ def home():
         "status": "success",
         "message": "Placement Prediction ML API is running",
         "version": "2.0",
+        "scoring_rules_version": scoring_rules.version,
         "features": ["readiness_score", "skill_gap_analyzer", "smart_roadmap"],
-        "endpoints": ["/predict", "/analyze"]
+        "endpoints": ["/predict", "/predict/batch", "/analyze", "/whatif", "/metrics", "/drift", "/shadow"],
+        "inference": inference_pool.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Serving counters"""
+    return jsonify({
+        "admission": admission.stats(),
+        "coalescing": coalescer.stats(),
+        "inference": inference_pool.stats(),
+        "models": model_registry.stats()
     })
 
+def normalize_profile(data):
+    """Cast the model features the way the model sees them (cgpa float, the rest int)"""
+    return {
+        'cgpa': float(data['cgpa']),
+        'dsa_score': int(data['dsa_score']),
+        'projects': int(data['projects']),
+        'communication': int(data['communication']),
+        'internships': int(data['internships'])
+    }
+
+def build_prediction(data, bundle):
+    """
+    Full /predict pipeline for a normalized profile and a tenant's model bundle
+    Depends only on those two, so identical concurrent requests can share it
+    """
+    # Extract features
+    features = np.array([[data[f] for f in FEATURE_NAMES]])
+    
+    # Scale features
+    features_scaled = bundle.scaler.transform(features)
+    
+    # Predict probability
+    probability = bundle.model.predict_proba(features_scaled)[0][1]
+    prediction = bundle.model.predict(features_scaled)[0]
+    contributions = explain_contributions(features_scaled, bundle.model)[0]
+    scoring = score_profile(data, probability)
+    
+    # ============================================
+    # NEW: CALCULATE READINESS SCORE
+    # ============================================
+    readiness_score = calculate_readiness_score(data, scoring)
+    
+    # ============================================
+    # NEW: ANALYZE SKILL GAPS
+    # ============================================
+    weak_skills, skill_gaps = analyze_skill_gaps(data, scoring)
+    
+    # ============================================
+    # NEW: GENERATE SMART ROADMAP
+    # ============================================
+    roadmap_tasks = generate_smart_roadmap(data, skill_gaps)
+    
+    # Generate recommendations
+    recommendations = generate_recommendations(skill_gaps, readiness_score)
+    
+    # Calculate skill scores as percentages
+    skill_scores = {f: round(float(v), 1) for f, v in zip(FEATURE_NAMES, scoring['skill_pct'][0])}
+    
+    # Ideal skill scores for comparison
+    ideal_scores = dict(zip(FEATURE_NAMES, scoring_rules.ideal_pct.tolist()))
+    
+    # ============================================
+    # PRO FEATURES: AI RECOMMENDATION ENGINE
+    # ============================================
+    recommendation_level = get_recommendation_level(scoring)
+    ai_recommendations = generate_ai_recommendations(skill_gaps, probability, readiness_score)
+    skill_insights = identify_skill_insights(skill_scores, contributions, scoring)
+    
+    return {
+        "status": "success",
+        "model": bundle.name,
+        "prediction": {
+            "placement_probability": round(probability * 100, 2),
+            "will_be_placed": bool(prediction),
+            "confidence": "High" if probability > 0.8 or probability < 0.2 else "Medium" if probability > 0.6 or probability < 0.4 else "Low"
+        },
+        "readiness_score": readiness_score,
+        "weak_skills": weak_skills,
+        "recommendation_level": recommendation_level,
+        "ai_recommendations": ai_recommendations,
+        "strongest_skill": skill_insights['strongest_skill'],
+        "weakest_skill": skill_insights['weakest_skill'],
+        "placement_category": skill_insights['placement_category'],
+        "explanation": format_explanation(contributions, bundle.model),
+        "skill_analysis": {
+            "scores": skill_scores,
+            "ideal_scores": ideal_scores,
+            "skill_gaps": skill_gaps,
+            "recommendations": recommendations
+        },
+        "roadmap_tasks": roadmap_tasks
+    }
+
+@app.route('/drift', methods=['GET'])
+def drift():
+    """Compare live input distributions with the training data (PSI / KS per feature)"""
+    return jsonify({"status": "success", **drift_monitor.report()})
+
+@app.route('/drift/reset', methods=['POST'])
+@admin_required
+def drift_reset():
+    """Start a fresh live window"""
+    drift_monitor.reset()
+    return jsonify({"status": "success"})
+
+@app.route('/shadow', methods=['GET'])
+def shadow_report():
+    """Agreement and latency of the shadow candidate against the primary model"""
+    if shadow is None:
+        return jsonify({"status": "success", "enabled": False})
+    return jsonify({"status": "success", "enabled": True, **shadow.report()})
+
+@app.route('/shadow/reset', methods=['POST'])
+@admin_required
+def shadow_reset():
+    """Start a fresh comparison window"""
+    if shadow is not None:
+        shadow.reset()
+    return jsonify({"status": "success"})
+
+@app.route('/debug/slow', methods=['GET'])
+@admin_required
+def debug_slow():
+    """
+    Slowest requests since start and the most recent ones, with stage timings
+    Query: limit (default 20), route (e.g. /predict)
+    """
+    limit = max(1, min(request.args.get('limit', 20, type=int), tracer.capacity))
+    return jsonify({"status": "success", **tracer.report(limit, request.args.get('route'))})
+
+@app.route('/debug/slow/reset', methods=['POST'])
+@admin_required
+def debug_slow_reset():
+    """Forget the traced requests"""
+    tracer.reset()
+    return jsonify({"status": "success"})
+
 @app.route('/predict', methods=['POST'])
+@admission.guard(client_key)
 def predict():
     """
     Predict placement probability with advanced analytics
     Returns: placement_probability, readiness_score, weak_skills, roadmap_tasks
+    Identical profiles in flight at the same time are computed once
     """
     try:
         data = request.get_json()
@@ -392,87 +711,88 @@ def predict():
             if field not in data:
                 return jsonify({"error": f"Missing field: {field}"}), 400
         
-        # Extract features
-        features = np.array([[
-            float(data['cgpa']),
-            int(data['dsa_score']),
-            int(data['projects']),
-            int(data['communication']),
-            int(data['internships'])
-        ]])
-        
-        # Scale features
-        features_scaled = scaler.transform(features)
-        
-        # Predict probability
-        probability = model.predict_proba(features_scaled)[0][1]
-        prediction = model.predict(features_scaled)[0]
-        
-        # ============================================
-        # NEW: CALCULATE READINESS SCORE
-        # ============================================
-        readiness_score = calculate_readiness_score(data)
-        
-        # ============================================
-        # NEW: ANALYZE SKILL GAPS
-        # ============================================
-        weak_skills, skill_gaps = analyze_skill_gaps(data)
-        
-        # ============================================
-        # NEW: GENERATE SMART ROADMAP
-        # ============================================
-        roadmap_tasks = generate_smart_roadmap(data, skill_gaps)
+        profile = normalize_profile(data)
+        with tracer.stage('drift'):
+            drift_monitor.observe(profile)
+        with tracer.stage('model'):
+            bundle = tenant_bundle()
+        key = (bundle.name,) + tuple(profile[f] for f in FEATURE_NAMES)
+        with tracer.stage('predict'):
+            result = coalescer.do(key, lambda: build_prediction(profile, bundle))
+        # The candidate is only compared against the default model
+        if shadow is not None and bundle is model_registry.default:
+            shadow.offer(key[1:])
+        with tracer.stage('serialize'):
+            return jsonify(result)
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Most profiles accepted in one /predict/batch call (admission counts a batch as one request)
+BATCH_MAX_PROFILES = int(os.environ.get('BATCH_MAX_PROFILES', 10000))
+
+@app.route('/predict/batch', methods=['POST'])
+@admission.guard(client_key)
+def predict_batch():
+    """
+    Score many profiles in one call
+    Body: {"profiles": [{cgpa, dsa_score, projects, communication, internships}, ...]}
+    Large batches are split across the inference worker pool
+    """
+    try:
+        data = request.get_json()
+        profiles = data.get('profiles') if isinstance(data, dict) else None
         
-        # Generate recommendations
-        recommendations = generate_recommendations(skill_gaps, readiness_score)
+        if not profiles:
+            return jsonify({"error": "Missing field: profiles"}), 400
+        if not isinstance(profiles, list):
+            return jsonify({"error": "profiles must be a list of profile objects"}), 400
+        if len(profiles) > BATCH_MAX_PROFILES:
+            return jsonify({"error": f"Too many profiles: {len(profiles)} (max {BATCH_MAX_PROFILES})"}), 400
         
-        # Calculate skill scores as percentages
-        skill_scores = {}
-        for feature in FEATURE_NAMES:
-            score = data[feature]
-            max_score = SKILL_MAX[feature]
-            percentage = (score / max_score) * 100
-            skill_scores[feature] = round(percentage, 1)
+        for index, profile in enumerate(profiles):
+            if not isinstance(profile, dict):
+                return jsonify({"error": f"profile {index} must be an object"}), 400
+            for field in FEATURE_NAMES:
+                if field not in profile:
+                    return jsonify({"error": f"Missing field: {field} (profile {index})"}), 400
         
-        # Ideal skill scores for comparison
-        ideal_scores = {
-            'cgpa': (IDEAL_SKILLS['cgpa'] / SKILL_MAX['cgpa']) * 100,
-            'dsa_score': (IDEAL_SKILLS['dsa_score'] / SKILL_MAX['dsa_score']) * 100,
-            'projects': (IDEAL_SKILLS['projects'] / SKILL_MAX['projects']) * 100,
-            'communication': (IDEAL_SKILLS['communication'] / SKILL_MAX['communication']) * 100,
-            'internships': (IDEAL_SKILLS['internships'] / SKILL_MAX['internships']) * 100
-        }
+        with tracer.stage('parse'):
+            features = np.array([[float(p[f]) for f in FEATURE_NAMES] for p in profiles])
+        with tracer.stage('drift'):
+            drift_monitor.observe_batch(features)
+        with tracer.stage('model'):
+            bundle = tenant_bundle()
+        with tracer.stage('inference'):
+            if bundle is model_registry.default:
+                probability, readiness, skill_pct, contributions = inference_pool.score(features)
+            else:
+                # Tenant models are scored in-process; the worker pool holds the default table
+                probability, readiness, skill_pct, contributions = score_matrix(bundle.table, features)
         
-        # ============================================
-        # PRO FEATURES: AI RECOMMENDATION ENGINE
-        # ============================================
-        recommendation_level = get_recommendation_level(probability)
-        ai_recommendations = generate_ai_recommendations(skill_gaps, probability, readiness_score)
-        skill_insights = identify_skill_insights(data, skill_scores)
+        weak_mask = features < scoring_rules.ideal
         
-        return jsonify({
-            "status": "success",
-            "prediction": {
-                "placement_probability": round(probability * 100, 2),
-                "will_be_placed": bool(prediction),
-                "confidence": "High" if probability > 0.8 or probability < 0.2 else "Medium" if probability > 0.6 or probability < 0.4 else "Low"
-            },
-            "readiness_score": readiness_score,
-            "weak_skills": weak_skills,
-            "recommendation_level": recommendation_level,
-            "ai_recommendations": ai_recommendations,
-            "strongest_skill": skill_insights['strongest_skill'],
-            "weakest_skill": skill_insights['weakest_skill'],
-            "placement_category": skill_insights['placement_category'],
-            "skill_analysis": {
-                "scores": skill_scores,
-                "ideal_scores": ideal_scores,
-                "skill_gaps": skill_gaps,
-                "recommendations": recommendations
-            },
-            "roadmap_tasks": roadmap_tasks
-        })
+        with tracer.stage('serialize'):
+            results = []
+            for i in range(len(profiles)):
+                results.append({
+                    "placement_probability": round(float(probability[i]) * 100, 2),
+                    "will_be_placed": bool(probability[i] > 0.5),
+                    "readiness_score": round(float(readiness[i]), 2),
+                    "weak_skills": [FEATURE_LABELS[f] for f, weak in zip(FEATURE_NAMES, weak_mask[i]) if weak],
+                    "scores": {f: round(float(v), 1) for f, v in zip(FEATURE_NAMES, skill_pct[i])},
+                    "explanation": format_explanation(contributions[i], bundle.model)
+                })
+            
+            return jsonify({
+                "status": "success",
+                "model": bundle.name,
+                "count": len(results),
+                "results": results
+            })
     
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -484,11 +804,13 @@ def analyze():
     try:
         data = request.get_json()
         
+        scoring = score_profile(data)
+        
         # Calculate readiness score
-        readiness_score = calculate_readiness_score(data)
+        readiness_score = calculate_readiness_score(data, scoring)
         
         # Analyze skill gaps
-        weak_skills, skill_gaps = analyze_skill_gaps(data)
+        weak_skills, skill_gaps = analyze_skill_gaps(data, scoring)
         
         # Generate roadmap
         roadmap_tasks = generate_smart_roadmap(data, skill_gaps)
@@ -497,12 +819,7 @@ def analyze():
         recommendations = generate_recommendations(skill_gaps, readiness_score)
         
         # Calculate skill scores
-        skill_scores = {}
-        for feature in FEATURE_NAMES:
-            score = data.get(feature, 0)
-            max_score = SKILL_MAX[feature]
-            percentage = (score / max_score) * 100
-            skill_scores[feature] = round(percentage, 1)
+        skill_scores = {f: round(float(v), 1) for f, v in zip(FEATURE_NAMES, scoring['skill_pct'][0])}
         
         return jsonify({
             "status": "success",
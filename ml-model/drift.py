@@ -0,0 +1,124 @@
+"""
+Input-drift monitoring for the prediction endpoints
+Keeps a fixed-bin histogram per feature for live traffic and compares it
+with the training distribution using PSI and the KS statistic
+"""
+
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Bin edges per feature; values outside the range fall into the end bins
+BIN_EDGES = {
+    'cgpa': np.arange(0.5, 10, 0.5).tolist(),
+    'dsa_score': np.arange(5, 100, 5).tolist(),
+    'projects': [0.5, 1.5, 2.5, 3.5, 4.5, 5.5],
+    'communication': [x + 0.5 for x in range(10)],
+    'internships': [0.5, 1.5, 2.5, 3.5]
+}
+
+# Population Stability Index bands
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+
+def _histogram(values, edges):
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+
+def _proportions(counts):
+    # Additive smoothing keeps PSI finite when a bin is empty on one side
+    counts = np.asarray(counts, dtype=np.float64) + 0.5
+    return counts / counts.sum()
+
+
+def population_stability_index(expected, actual):
+    e, a = _proportions(expected), _proportions(actual)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_statistic(expected, actual):
+    """Largest gap between the two binned CDFs"""
+    e = np.cumsum(expected) / max(1, np.sum(expected))
+    a = np.cumsum(actual) / max(1, np.sum(actual))
+    return float(np.max(np.abs(a - e)))
+
+
+class DriftMonitor:
+    """Constant-memory per-feature histograms of live inputs"""
+
+    def __init__(self, features, reference_path=None, bin_edges=BIN_EDGES):
+        self.features = list(features)
+        self.edges = {f: bin_edges[f] for f in self.features}
+        self.counts = {f: [0] * (len(self.edges[f]) + 1) for f in self.features}
+        self.observed = 0
+        self.lock = threading.Lock()
+        self.reference = None
+        self.reference_rows = 0
+        if reference_path:
+            self.set_reference(pd.read_csv(reference_path))
+
+    def set_reference(self, df):
+        """Histogram the training data with the same bins"""
+        self.reference = {f: _histogram(df[f].to_numpy(), self.edges[f]) for f in self.features}
+        self.reference_rows = len(df)
+
+    def observe(self, profile):
+        """Record one request's features (a few microseconds, no allocation per request)"""
+        bins = [bisect.bisect_right(self.edges[f], profile[f]) for f in self.features]
+        with self.lock:
+            for f, b in zip(self.features, bins):
+                self.counts[f][b] += 1
+            self.observed += 1
+
+    def observe_batch(self, X):
+        """Record a feature matrix (columns in self.features order) in one pass"""
+        hists = [_histogram(X[:, i], self.edges[f]) for i, f in enumerate(self.features)]
+        with self.lock:
+            for f, h in zip(self.features, hists):
+                counts = self.counts[f]
+                for b, n in enumerate(h.tolist()):
+                    counts[b] += n
+            self.observed += len(X)
+
+    def reset(self):
+        with self.lock:
+            for f in self.features:
+                self.counts[f] = [0] * len(self.counts[f])
+            self.observed = 0
+
+    def report(self):
+        """PSI and KS per feature against the training distribution"""
+        with self.lock:
+            live = {f: list(c) for f, c in self.counts.items()}
+            observed = self.observed
+
+        features = {}
+        for f in self.features:
+            entry = {
+                'psi': None,
+                'ks': None,
+                'status': 'insufficient data'
+            }
+            if observed and self.reference is not None:
+                psi = population_stability_index(self.reference[f], live[f])
+                entry.update({
+                    'psi': round(psi, 4),
+                    'ks': round(ks_statistic(self.reference[f], live[f]), 4),
+                    'status': ('significant drift' if psi >= PSI_SIGNIFICANT
+                               else 'moderate drift' if psi >= PSI_MODERATE else 'stable')
+                })
+            entry['live_histogram'] = live[f]
+            if self.reference is not None:
+                entry['training_histogram'] = self.reference[f].tolist()
+            entry['bin_edges'] = self.edges[f]
+            features[f] = entry
+
+        return {
+            'observed_requests': observed,
+            'training_rows': self.reference_rows,
+            'thresholds': {'moderate_psi': PSI_MODERATE, 'significant_psi': PSI_SIGNIFICANT},
+            'features': features
+        }
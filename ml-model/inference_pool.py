@@ -0,0 +1,209 @@
+"""
+Process-pool inference for the Placement Prediction API
+Folds the StandardScaler into the LogisticRegression weights and publishes
+them, together with the scoring lookup tables, through shared memory so every
+worker process reads the same copy instead of unpickling its own model
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+# ============================================
+# SETTINGS
+# ============================================
+# 0 disables the pool and scores everything in-process
+POOL_SIZE = int(os.environ.get('INFERENCE_POOL_SIZE', 0))
+# Maximum number of chunks queued or running in the pool at once
+QUEUE_DEPTH = int(os.environ.get('INFERENCE_QUEUE_DEPTH', max(1, POOL_SIZE) * 4))
+# Rows per unit of work sent to a worker
+CHUNK_SIZE = int(os.environ.get('INFERENCE_CHUNK_SIZE', 2048))
+# Seconds to wait for a queue slot before rejecting the batch
+QUEUE_TIMEOUT = float(os.environ.get('INFERENCE_QUEUE_TIMEOUT', 2.0))
+
+# Shared table layout (one row each, N_FEATURES + 1 columns)
+#   row 0: fused logit weights, column 0 holds the bias
+#   row 1: readiness points per unit, column 0 holds the readiness cap
+#   row 2: 100 / scale, column 0 unused
+#   row 3: per-feature logit offsets coef * mean / scale, column 0 holds the
+#          model intercept, so contribution_j = x_j * weight_j - offset_j
+#          equals coef_j * scaled x_j
+#   row 4: most readiness points each feature can contribute, column 0 unused
+ROW_LOGIT = 0
+ROW_READINESS = 1
+ROW_SKILL_PCT = 2
+ROW_OFFSET = 3
+ROW_READINESS_LIMIT = 4
+N_ROWS = 5
+
+
+class PoolSaturated(Exception):
+    """Raised when the inference queue is full"""
+
+
+def fuse_weights(model, scaler):
+    """
+    Fold the scaler into the logistic regression so that
+    logit = bias + X @ weights works directly on raw feature values
+    """
+    coef = model.coef_[0] / scaler.scale_
+    bias = model.intercept_[0] - np.dot(coef, scaler.mean_)
+    return float(bias), coef.astype(np.float64)
+
+
+def build_tables(model, scaler, rules):
+    """Build the shared scoring table from the model and compiled ScoringRules"""
+    bias, weights = fuse_weights(model, scaler)
+    n_features = len(weights)
+    table = np.zeros((N_ROWS, n_features + 1), dtype=np.float64)
+    table[ROW_LOGIT, 0] = bias
+    table[ROW_LOGIT, 1:] = weights
+    table[ROW_READINESS, 0] = rules.readiness_cap
+    table[ROW_READINESS, 1:] = rules.readiness_per_unit
+    table[ROW_SKILL_PCT, 1:] = rules.pct_per_unit
+    table[ROW_READINESS_LIMIT, 1:] = rules.readiness_limit
+    table[ROW_OFFSET, 0] = model.intercept_[0]
+    table[ROW_OFFSET, 1:] = model.coef_[0] * scaler.mean_ / scaler.scale_
+    return table
+
+
+def score_matrix(table, X):
+    """
+    Score a matrix of raw features against a scoring table
+    Returns (probability, readiness, skill_pct, contributions) as arrays, where
+    contributions holds each feature's share of the logit (coef x scaled value)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    contributions = X * table[ROW_LOGIT, 1:] - table[ROW_OFFSET, 1:]
+    logit = table[ROW_OFFSET, 0] + contributions.sum(axis=1)
+    probability = 1.0 / (1.0 + np.exp(-logit))
+    readiness = np.minimum(
+        table[ROW_READINESS, 0],
+        np.minimum(X * table[ROW_READINESS, 1:], table[ROW_READINESS_LIMIT, 1:]).sum(axis=1)
+    )
+    skill_pct = np.minimum(100.0, X * table[ROW_SKILL_PCT, 1:])
+    return probability, readiness, skill_pct, contributions
+
+
+# ============================================
+# WORKER SIDE
+# ============================================
+_worker_shm = None
+_worker_table = None
+
+
+def _attach(shm_name, shape):
+    """Pool initializer: map the shared table without copying it"""
+    global _worker_shm, _worker_table
+    # Forked workers share the parent's resource tracker, so the parent's
+    # unlink at shutdown is the only cleanup needed
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_table = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+
+
+def _score_chunk(X):
+    return score_matrix(_worker_table, X)
+
+
+# ============================================
+# FRONT-END SIDE
+# ============================================
+class InferencePool:
+    """
+    Scores feature matrices on a pool of worker processes
+    Small batches, or a disabled pool, are scored in-process with the same table
+    """
+
+    def __init__(self, table, pool_size=POOL_SIZE, queue_depth=QUEUE_DEPTH,
+                 chunk_size=CHUNK_SIZE):
+        self.pool_size = pool_size
+        self.chunk_size = chunk_size
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        self._lock = threading.Lock()
+        self._executor = None
+
+        self._shm = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        self.table = np.ndarray(table.shape, dtype=np.float64, buffer=self._shm.buf)
+        self.table[:] = table
+        atexit.register(self.close)
+
+    def _get_executor(self):
+        # Created lazily so forking servers start the pool after the fork
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.pool_size,
+                        mp_context=get_context('fork'),
+                        initializer=_attach,
+                        initargs=(self._shm.name, self.table.shape)
+                    )
+        return self._executor
+
+    def _discard_executor(self, executor):
+        """Drop a broken pool (a worker died) so the next call starts a new one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def score(self, X):
+        """Score a feature matrix, fanning chunks out to the pool when it pays off"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.pool_size <= 0 or len(X) <= self.chunk_size:
+            return score_matrix(self.table, X)
+
+        try:
+            parts = self._score_chunks(X)
+        except BrokenProcessPool:
+            # Scoring is side-effect free, so retry once on a fresh pool
+            parts = self._score_chunks(X)
+        return tuple(np.concatenate([p[i] for p in parts]) for i in range(len(parts[0])))
+
+    def _score_chunks(self, X):
+        executor = self._get_executor()
+        futures = []
+        try:
+            for start in range(0, len(X), self.chunk_size):
+                if not self._slots.acquire(timeout=QUEUE_TIMEOUT):
+                    raise PoolSaturated('Inference queue is full, retry later')
+                future = executor.submit(_score_chunk, X[start:start + self.chunk_size])
+                future.add_done_callback(lambda _: self._slots.release())
+                futures.append(future)
+            return [f.result() for f in futures]
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+    def stats(self):
+        """Current pool settings"""
+        return {
+            'pool_size': self.pool_size,
+            'queue_depth': self.queue_depth,
+            'chunk_size': self.chunk_size,
+            'shared_table_bytes': self.table.nbytes
+        }
+
+    def close(self):
+        """Shut the pool down and release the shared segment"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._shm is not None:
+            self.table = None
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
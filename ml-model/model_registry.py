@@ -0,0 +1,166 @@
+"""
+Tenant-aware model routing
+Each tenant (e.g. a college) can ship its own model trained on its own
+outcomes as MODELS_DIR/<tenant>/placement_model.joblib + scaler.joblib.
+Tenant models are loaded on first use into an LRU cache bounded by their
+in-memory size; tenants without artifacts, or whose artifacts fail to load,
+are served by the default model
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
+
+import joblib
+
+from inference_pool import build_tables
+from singleflight import SingleFlight
+
+# ============================================
+# SETTINGS
+# ============================================
+MODELS_DIR = os.environ.get('MODELS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+# Memory budget for loaded tenant models (the default model is not counted)
+MODEL_CACHE_BYTES = int(os.environ.get('MODEL_CACHE_BYTES', 256 * 1024 * 1024))
+# Seconds before a tenant whose artifacts failed to load is tried again
+MODEL_RETRY_SECONDS = float(os.environ.get('MODEL_RETRY_SECONDS', 60))
+
+TENANT_HEADER = 'X-Tenant-ID'
+MODEL_FILE = 'placement_model.joblib'
+SCALER_FILE = 'scaler.joblib'
+_TENANT_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+
+def valid_tenant(tenant):
+    """Tenant ids double as directory names, so only plain slugs are accepted"""
+    return isinstance(tenant, str) and bool(_TENANT_ID.match(tenant))
+
+
+class ModelBundle:
+    """A model and its scaler, plus the scoring table derived from them"""
+
+    def __init__(self, model, scaler, rules=None, tenant=None, nbytes=0):
+        self.model = model
+        self.scaler = scaler
+        self.rules = rules
+        self.tenant = tenant
+        self.nbytes = nbytes
+
+    @property
+    def name(self):
+        return self.tenant or 'default'
+
+    @cached_property
+    def version(self):
+        """Tenant name plus a digest of the fitted parameters, e.g. 'default@1a2b3c4d5e'"""
+        digest = hashlib.sha1(pickle.dumps((self.model, self.scaler), protocol=pickle.HIGHEST_PROTOCOL))
+        return f'{self.name}@{digest.hexdigest()[:10]}'
+
+    @cached_property
+    def table(self):
+        """Fused scoring table for score_matrix (see inference_pool.py)"""
+        return build_tables(self.model, self.scaler, self.rules)
+
+
+def load_bundle(directory, n_features, rules=None, tenant=None):
+    """Load and validate the model + scaler artifacts in a directory"""
+    model = joblib.load(os.path.join(directory, MODEL_FILE))
+    scaler = joblib.load(os.path.join(directory, SCALER_FILE))
+    # Explanations and the scoring tables rely on a linear model over the same features
+    if model.coef_.shape != (1, n_features) or len(scaler.mean_) != n_features:
+        raise ValueError(f'expected a linear model over {n_features} features')
+    nbytes = len(pickle.dumps((model, scaler), protocol=pickle.HIGHEST_PROTOCOL))
+    return ModelBundle(model, scaler, rules, tenant, nbytes)
+
+
+class ModelRegistry:
+    """
+    Resolves a tenant id to its ModelBundle
+
+    Cache hits take one short lock. A miss loads outside that lock through a
+    SingleFlight keyed by tenant, so concurrent requests for a cold tenant
+    share one load and requests for other tenants are never blocked by it.
+    """
+
+    def __init__(self, default, n_features, models_dir=MODELS_DIR, max_bytes=MODEL_CACHE_BYTES,
+                 retry_seconds=MODEL_RETRY_SECONDS):
+        self.default = default
+        self.models_dir = models_dir
+        self.max_bytes = max_bytes
+        self.retry_seconds = retry_seconds
+        self.n_features = n_features
+
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # tenant -> ModelBundle, least recently used first
+        self.cached_bytes = 0
+        self.failed = {}  # tenant -> time of the failed load
+        self.loads = SingleFlight()
+        self.counters = {'hits': 0, 'misses': 0, 'loads': 0, 'load_errors': 0, 'evictions': 0, 'fallbacks': 0}
+
+    def get(self, tenant):
+        """The tenant's bundle, or the default bundle when it has none"""
+        if not tenant:
+            return self.default
+        with self.lock:
+            bundle = self.cache.get(tenant)
+            if bundle is not None:
+                self.cache.move_to_end(tenant)
+                self.counters['hits'] += 1
+                return bundle
+            self.counters['misses'] += 1
+            failed_at = self.failed.get(tenant)
+
+        if not valid_tenant(tenant) or (failed_at and time.time() - failed_at < self.retry_seconds):
+            return self._fallback()
+        directory = os.path.join(self.models_dir, tenant)
+        if not os.path.isfile(os.path.join(directory, MODEL_FILE)):
+            return self._fallback()
+
+        bundle = self.loads.do(tenant, lambda: self._load(tenant, directory))
+        return bundle if bundle is not None else self._fallback()
+
+    def _fallback(self):
+        with self.lock:
+            self.counters['fallbacks'] += 1
+        return self.default
+
+    def _load(self, tenant, directory):
+        """Load, validate and cache a tenant's artifacts; None if they are unusable"""
+        with self.lock:
+            # Another caller may have finished loading between our miss and this call
+            if tenant in self.cache:
+                return self.cache[tenant]
+        try:
+            bundle = load_bundle(directory, self.n_features, self.default.rules, tenant)
+        except Exception as e:
+            print(f"⚠️ Could not load model for tenant {tenant}: {type(e).__name__}: {e}")
+            with self.lock:
+                self.failed[tenant] = time.time()
+                self.counters['load_errors'] += 1
+            return None
+
+        with self.lock:
+            self.failed.pop(tenant, None)
+            self.counters['loads'] += 1
+            self.cache[tenant] = bundle
+            self.cached_bytes += bundle.nbytes
+            # Evict least recently used tenants until the budget holds (keep the newest)
+            while self.cached_bytes > self.max_bytes and len(self.cache) > 1:
+                _, evicted = self.cache.popitem(last=False)
+                self.cached_bytes -= evicted.nbytes
+                self.counters['evictions'] += 1
+        return bundle
+
+    def stats(self):
+        with self.lock:
+            return dict(
+                self.counters,
+                tenants_loaded=list(self.cache),
+                cached_bytes=self.cached_bytes,
+                max_bytes=self.max_bytes
+            )
@@ -0,0 +1,160 @@
+"""
+Shadow evaluation of a candidate model on live traffic
+A sample of /predict inputs is queued (never waited on) for a background
+thread that scores each one with both the primary and the candidate model,
+timing them the same way, and keeps a rolling window of the pairs so
+agreement, probability differences and latency can be compared before the
+candidate is promoted
+"""
+
+import collections
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+# ============================================
+# SETTINGS
+# ============================================
+# Directory holding the candidate placement_model.joblib + scaler.joblib (unset = shadow off)
+SHADOW_MODEL_DIR = os.environ.get('SHADOW_MODEL_DIR', '')
+# Fraction of /predict requests also scored by the candidate
+SHADOW_SAMPLE_RATE = float(os.environ.get('SHADOW_SAMPLE_RATE', 0.1))
+# Sampled inputs waiting for the shadow thread; more are dropped, not waited for
+SHADOW_QUEUE_DEPTH = int(os.environ.get('SHADOW_QUEUE_DEPTH', 1000))
+# Most recent comparisons the stats are computed over
+SHADOW_WINDOW = int(os.environ.get('SHADOW_WINDOW', 10000))
+
+# Window record layout
+PRIMARY_PROB, CANDIDATE_PROB, PRIMARY_MS, CANDIDATE_MS = range(4)
+
+
+def _predict_probability(bundle, features):
+    started = time.perf_counter()
+    probability = bundle.model.predict_proba(bundle.scaler.transform(features))[0][1]
+    return float(probability), (time.perf_counter() - started) * 1000
+
+
+class ShadowEvaluator:
+    """Scores sampled inputs with a candidate model next to the primary one"""
+
+    def __init__(self, primary, candidate, rules=None, sample_rate=SHADOW_SAMPLE_RATE,
+                 queue_depth=SHADOW_QUEUE_DEPTH, window=SHADOW_WINDOW, name=None):
+        self.primary = primary
+        self.candidate = candidate
+        self.rules = rules
+        self.sample_rate = sample_rate
+        self.name = name
+        self.window = window
+
+        self.pending = queue.Queue(maxsize=queue_depth)
+        self.lock = threading.Lock()
+        self.results = collections.deque(maxlen=window)
+        self.counters = {'sampled': 0, 'dropped': 0, 'scored': 0, 'errors': 0}
+
+        self.worker = threading.Thread(target=self._run, name='shadow-eval', daemon=True)
+        self.worker.start()
+
+    # ---------- request side ----------
+    def offer(self, features):
+        """Maybe queue a feature row for shadow scoring; never blocks"""
+        if random.random() >= self.sample_rate:
+            return False
+        try:
+            self.pending.put_nowait(features)
+        except queue.Full:
+            with self.lock:
+                self.counters['dropped'] += 1
+            return False
+        with self.lock:
+            self.counters['sampled'] += 1
+        return True
+
+    # ---------- shadow thread ----------
+    def _run(self):
+        flip = False
+        while True:
+            features = self.pending.get()
+            if features is None:
+                return
+            try:
+                X = np.asarray(features, dtype=np.float64).reshape(1, -1)
+                # Alternate which model runs first so neither always gets the warm caches
+                flip = not flip
+                if flip:
+                    p_primary, t_primary = _predict_probability(self.primary, X)
+                    p_candidate, t_candidate = _predict_probability(self.candidate, X)
+                else:
+                    p_candidate, t_candidate = _predict_probability(self.candidate, X)
+                    p_primary, t_primary = _predict_probability(self.primary, X)
+            except Exception as e:
+                print(f"⚠️ Shadow scoring failed: {e}")
+                with self.lock:
+                    self.counters['errors'] += 1
+                continue
+            with self.lock:
+                self.results.append((p_primary, p_candidate, t_primary, t_candidate))
+                self.counters['scored'] += 1
+
+    def close(self, timeout=5):
+        try:
+            self.pending.put_nowait(None)
+        except queue.Full:
+            return
+        self.worker.join(timeout)
+
+    # ---------- reads ----------
+    def report(self):
+        with self.lock:
+            window = np.array(self.results, dtype=np.float64).reshape(-1, 4)
+            counters = dict(self.counters)
+
+        report = {
+            'candidate': self.name,
+            'sample_rate': self.sample_rate,
+            **counters,
+            'queued': self.pending.qsize(),
+            'window': len(window)
+        }
+        if not len(window):
+            return report
+
+        primary, candidate = window[:, PRIMARY_PROB], window[:, CANDIDATE_PROB]
+        diff = candidate - primary
+        abs_diff = np.abs(diff) * 100
+        agreement = {'will_be_placed': round(float(np.mean((primary > 0.5) == (candidate > 0.5))), 4)}
+        if self.rules is not None and 'recommendation_level' in self.rules.tiers:
+            tiers = self.rules.tiers['recommendation_level']
+            same = tiers.index({'placement_probability': primary * 100}) == \
+                tiers.index({'placement_probability': candidate * 100})
+            agreement['recommendation_level'] = round(float(np.mean(same)), 4)
+
+        def latency(column):
+            ms = window[:, column]
+            return {
+                'mean': round(float(ms.mean()), 4),
+                'p50': round(float(np.percentile(ms, 50)), 4),
+                'p95': round(float(np.percentile(ms, 95)), 4),
+                'p99': round(float(np.percentile(ms, 99)), 4)
+            }
+
+        report.update({
+            'agreement': agreement,
+            # Percentage points, candidate minus primary
+            'probability_diff': {
+                'mean': round(float(diff.mean() * 100), 4),
+                'mean_abs': round(float(abs_diff.mean()), 4),
+                'p95_abs': round(float(np.percentile(abs_diff, 95)), 4),
+                'max_abs': round(float(abs_diff.max()), 4)
+            },
+            'latency_ms': {'primary': latency(PRIMARY_MS), 'candidate': latency(CANDIDATE_MS)}
+        })
+        return report
+
+    def reset(self):
+        with self.lock:
+            self.results.clear()
+            self.counters = dict.fromkeys(self.counters, 0)
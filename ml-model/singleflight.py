@@ -0,0 +1,60 @@
+"""
+Single-flight request coalescing
+Concurrent calls with the same key wait on one computation and share its
+result (or its exception); the key is forgotten as soon as the call finishes,
+so later calls always compute fresh
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical computations"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.counters = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent callers and return its result"""
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                self.counters['coalesced'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self.calls[key] = call
+                self.counters['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, in_flight=len(self.calls))
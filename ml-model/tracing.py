@@ -0,0 +1,150 @@
+"""
+Per-request tracing for the Flask apps
+Every request's route, status, payload sizes, total time and named stage
+timings go into a fixed-size ring buffer, and the slowest requests seen so
+far are kept in a min-heap, so the worst concrete requests and where their
+time went can be pulled from /debug/slow without request logging
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+
+# ============================================
+# SETTINGS
+# ============================================
+# Most recent requests kept in the ring buffer
+TRACE_CAPACITY = int(os.environ.get('TRACE_CAPACITY', 2048))
+# Slowest requests kept since start (or the last reset)
+TRACE_SLOWEST = int(os.environ.get('TRACE_SLOWEST', 50))
+
+# Record layout (a tuple per request keeps the hot path allocation-light)
+SEQ, TIMESTAMP, METHOD, ROUTE, STATUS, DURATION, REQUEST_BYTES, RESPONSE_BYTES, STAGES = range(9)
+
+
+class RequestTracer:
+    """
+    Ring buffer of recent requests plus a min-heap of the slowest
+
+    Writers never lock the ring: each request takes a slot number from an
+    itertools.count (atomic under the GIL) and stores its record with a
+    single list assignment. The heap is only locked when a request is slower
+    than the current N-th slowest, which after warm-up is rare.
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY, slowest=TRACE_SLOWEST):
+        self.capacity = capacity
+        self.slowest_n = slowest
+        self.ring = [None] * capacity
+        self.sequence = itertools.count()
+        self.slowest = []  # min-heap of (duration, seq, record)
+        self.heap_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        return self
+
+    # ---------- request hooks ----------
+    def _start(self):
+        g.trace_started = time.perf_counter()
+        g.trace_stages = []
+
+    def _finish(self, response):
+        started = g.pop('trace_started', None)
+        if started is None:
+            return response
+        duration = time.perf_counter() - started
+        seq = next(self.sequence)
+        record = (
+            seq,
+            time.time(),
+            request.method,
+            # Route template rather than the raw path keeps ids out of the trace
+            request.url_rule.rule if request.url_rule else request.path,
+            response.status_code,
+            duration,
+            request.content_length or 0,
+            # None for streamed bodies, which are sent after this hook runs
+            response.calculate_content_length(),
+            tuple(g.pop('trace_stages', ()))
+        )
+        self.ring[seq % self.capacity] = record
+
+        heap = self.slowest
+        if len(heap) < self.slowest_n or duration > heap[0][0]:
+            with self.heap_lock:
+                if len(heap) < self.slowest_n:
+                    heapq.heappush(heap, (duration, seq, record))
+                elif duration > heap[0][0]:
+                    heapq.heappushpop(heap, (duration, seq, record))
+        return response
+
+    @contextmanager
+    def stage(self, name):
+        """Time a named stage of the current request"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stages = g.get('trace_stages')
+            if stages is not None:
+                stages.append((name, time.perf_counter() - started))
+
+    # ---------- reads ----------
+    @staticmethod
+    def _format(record):
+        duration = record[DURATION]
+        stages = {}
+        for name, seconds in record[STAGES]:
+            stages[name] = round(stages.get(name, 0.0) + seconds * 1000, 3)
+        return {
+            'timestamp': record[TIMESTAMP],
+            'method': record[METHOD],
+            'route': record[ROUTE],
+            'status': record[STATUS],
+            'duration_ms': round(duration * 1000, 3),
+            'request_bytes': record[REQUEST_BYTES],
+            'response_bytes': record[RESPONSE_BYTES],
+            'stages_ms': stages,
+            'untracked_ms': round(max(0.0, duration * 1000 - sum(stages.values())), 3)
+        }
+
+    def recent(self):
+        """Records currently in the ring, oldest first"""
+        return sorted((r for r in list(self.ring) if r is not None), key=lambda r: r[SEQ])
+
+    def report(self, limit=20, route=None):
+        with self.heap_lock:
+            slowest = sorted(self.slowest, reverse=True)
+        recent = self.recent()
+        recorded = recent[-1][SEQ] + 1 if recent else 0
+        if route:
+            slowest = [entry for entry in slowest if entry[2][ROUTE] == route]
+            recent = [r for r in recent if r[ROUTE] == route]
+
+        durations = sorted(r[DURATION] for r in recent)
+
+        def percentile(q):
+            if not durations:
+                return None
+            return round(durations[min(len(durations) - 1, int(q * len(durations)))] * 1000, 3)
+
+        return {
+            'recorded': recorded,
+            'capacity': self.capacity,
+            'window': len(recent),
+            'latency_ms': {'p50': percentile(0.5), 'p90': percentile(0.9), 'p99': percentile(0.99)},
+            'slowest': [self._format(record) for _, _, record in slowest[:limit]],
+            'recent': [self._format(record) for record in reversed(recent[-limit:])]
+        }
+
+    def reset(self):
+        with self.heap_lock:
+            self.slowest = []
+            self.ring = [None] * self.capacity
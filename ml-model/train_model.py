@@ -1,8 +1,15 @@
 """
 Training script for Placement Prediction Model
 Uses Logistic Regression to predict placement probability
+
+Usage:
+    python train_model.py                     Train and save the model
+    python train_model.py evaluate --data holdout.csv --report report.html
+                                              Score a held-out CSV chunk by chunk
 """
 
+import argparse
+import json
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -48,5 +55,175 @@ def train_placement_model():
     
     return model, scaler
 
+# ============================================
+# STREAMING EVALUATION
+# ============================================
+FEATURES = ['cgpa', 'dsa_score', 'projects', 'communication', 'internships']
+TARGET = 'placed'
+
+# Per-segment accuracy: column -> (bin edges, labels)
+SEGMENTS = {
+    'cgpa': ([-np.inf, 6, 7, 8, 9, np.inf], ['<6', '6-7', '7-8', '8-9', '9+']),
+    'internships': ([-np.inf, 0.5, 1.5, np.inf], ['0', '1', '2+']),
+    'projects': ([-np.inf, 1.5, 3.5, np.inf], ['0-1', '2-3', '4+'])
+}
+
+class StreamingEvaluator:
+    """
+    Accumulates evaluation metrics over chunks in constant memory
+    ROC-AUC comes from per-class score histograms, so nothing per-row is kept
+    """
+    
+    def __init__(self, threshold=0.5, score_bins=1000, calibration_bins=10):
+        self.threshold = threshold
+        self.score_bins = score_bins
+        self.calibration_bins = calibration_bins
+        self.confusion = np.zeros((2, 2), dtype=np.int64)  # [actual, predicted]
+        self.log_loss_sum = 0.0
+        self.count = 0
+        self.pos_hist = np.zeros(score_bins, dtype=np.int64)
+        self.neg_hist = np.zeros(score_bins, dtype=np.int64)
+        self.cal_count = np.zeros(calibration_bins, dtype=np.int64)
+        self.cal_pred = np.zeros(calibration_bins)
+        self.cal_actual = np.zeros(calibration_bins)
+        self.segments = {
+            column: {'correct': np.zeros(len(labels), dtype=np.int64),
+                     'count': np.zeros(len(labels), dtype=np.int64)}
+            for column, (_, labels) in SEGMENTS.items()
+        }
+    
+    def update(self, chunk, probability):
+        y = chunk[TARGET].to_numpy().astype(np.int64)
+        predicted = (probability >= self.threshold).astype(np.int64)
+        correct = predicted == y
+        
+        np.add.at(self.confusion, (y, predicted), 1)
+        p = np.clip(probability, 1e-15, 1 - 1e-15)
+        self.log_loss_sum -= float(np.sum(y * np.log(p) + (1 - y) * np.log(1 - p)))
+        self.count += len(y)
+        
+        score_bin = np.minimum((probability * self.score_bins).astype(np.int64), self.score_bins - 1)
+        self.pos_hist += np.bincount(score_bin[y == 1], minlength=self.score_bins)
+        self.neg_hist += np.bincount(score_bin[y == 0], minlength=self.score_bins)
+        
+        cal_bin = np.minimum((probability * self.calibration_bins).astype(np.int64), self.calibration_bins - 1)
+        self.cal_count += np.bincount(cal_bin, minlength=self.calibration_bins)
+        self.cal_pred += np.bincount(cal_bin, weights=probability, minlength=self.calibration_bins)
+        self.cal_actual += np.bincount(cal_bin, weights=y, minlength=self.calibration_bins)
+        
+        for column, (edges, labels) in SEGMENTS.items():
+            segment = np.digitize(chunk[column].to_numpy(), edges[1:-1])
+            self.segments[column]['count'] += np.bincount(segment, minlength=len(labels))
+            self.segments[column]['correct'] += np.bincount(segment, weights=correct, minlength=len(labels)).astype(np.int64)
+    
+    def roc_auc(self):
+        """Area under the ROC curve from the binned score histograms (ties count half)"""
+        pos, neg = self.pos_hist[::-1], self.neg_hist[::-1]
+        if pos.sum() == 0 or neg.sum() == 0:
+            return None
+        tpr = np.concatenate([[0], np.cumsum(pos)]) / pos.sum()
+        fpr = np.concatenate([[0], np.cumsum(neg)]) / neg.sum()
+        return float(np.sum((fpr[1:] - fpr[:-1]) * (tpr[1:] + tpr[:-1]) / 2))
+    
+    def report(self):
+        (tn, fp), (fn, tp) = self.confusion
+        nonempty = self.cal_count > 0
+        return {
+            'rows': int(self.count),
+            'threshold': self.threshold,
+            'accuracy': float((tp + tn) / self.count) if self.count else None,
+            'precision': float(tp / (tp + fp)) if tp + fp else None,
+            'recall': float(tp / (tp + fn)) if tp + fn else None,
+            'log_loss': self.log_loss_sum / self.count if self.count else None,
+            'roc_auc': self.roc_auc(),
+            'confusion_matrix': {'tn': int(tn), 'fp': int(fp), 'fn': int(fn), 'tp': int(tp)},
+            'calibration': [
+                {
+                    'bin': f'{i / self.calibration_bins:.1f}-{(i + 1) / self.calibration_bins:.1f}',
+                    'count': int(self.cal_count[i]),
+                    'mean_predicted': float(self.cal_pred[i] / self.cal_count[i]),
+                    'fraction_placed': float(self.cal_actual[i] / self.cal_count[i])
+                }
+                for i in np.flatnonzero(nonempty)
+            ],
+            'segments': {
+                column: [
+                    {
+                        'segment': label,
+                        'count': int(acc['count'][i]),
+                        'accuracy': float(acc['correct'][i] / acc['count'][i]) if acc['count'][i] else None
+                    }
+                    for i, label in enumerate(SEGMENTS[column][1])
+                ]
+                for column, acc in self.segments.items()
+            }
+        }
+
+def render_html_report(report):
+    """Render the evaluation report as a standalone HTML page"""
+    def table(rows):
+        if not rows:
+            return '<p>No data</p>'
+        head = ''.join(f'<th>{k}</th>' for k in rows[0])
+        body = ''.join('<tr>' + ''.join(f'<td>{v if not isinstance(v, float) else round(v, 4)}</td>' for v in r.values()) + '</tr>' for r in rows)
+        return f'<table><tr>{head}</tr>{body}</table>'
+    
+    summary = [{k: report[k] for k in ('rows', 'accuracy', 'precision', 'recall', 'log_loss', 'roc_auc')}]
+    sections = [
+        '<h2>Summary</h2>' + table(summary),
+        '<h2>Confusion matrix</h2>' + table([report['confusion_matrix']]),
+        '<h2>Calibration</h2>' + table(report['calibration'])
+    ] + [f'<h2>Accuracy by {column}</h2>' + table(rows) for column, rows in report['segments'].items()]
+    
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Placement Model Evaluation</title>'
+            '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}'
+            'td,th{border:1px solid #ccc;padding:4px 10px;text-align:right}</style></head><body>'
+            '<h1>Placement Model Evaluation</h1>' + ''.join(sections) + '</body></html>')
+
+def evaluate_model(data_path, report_path=None, chunk_size=100000,
+                   model_path='placement_model.joblib', scaler_path='scaler.joblib'):
+    """
+    Score a held-out CSV of any size chunk by chunk and write a JSON or HTML report
+    Memory use depends on chunk_size, not on the size of the file
+    """
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    evaluator = StreamingEvaluator()
+    
+    for chunk in pd.read_csv(data_path, chunksize=chunk_size):
+        chunk = chunk.dropna(subset=FEATURES + [TARGET])
+        if chunk.empty:
+            continue
+        X_scaled = scaler.transform(chunk[FEATURES].to_numpy(dtype=np.float64))
+        evaluator.update(chunk, model.predict_proba(X_scaled)[:, 1])
+    
+    report = evaluator.report()
+    print(f"Rows: {report['rows']}")
+    print(f"Accuracy: {report['accuracy'] * 100:.2f}%" if report['accuracy'] is not None else "Accuracy: n/a")
+    print(f"Log-loss: {report['log_loss']:.4f}" if report['log_loss'] is not None else "Log-loss: n/a")
+    print(f"ROC-AUC: {report['roc_auc']:.4f}" if report['roc_auc'] is not None else "ROC-AUC: n/a")
+    
+    if report_path:
+        with open(report_path, 'w') as f:
+            if report_path.endswith('.html'):
+                f.write(render_html_report(report))
+            else:
+                json.dump(report, f, indent=2)
+        print(f"Report written to {report_path}")
+    
+    return report
+
 if __name__ == "__main__":
-    train_placement_model()
+    parser = argparse.ArgumentParser(description='Train or evaluate the placement model')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('train', help='Train and save the model (default)')
+    evaluate_parser = subparsers.add_parser('evaluate', help='Evaluate the saved model on a held-out CSV')
+    evaluate_parser.add_argument('--data', required=True, help='CSV with feature columns and "placed"')
+    evaluate_parser.add_argument('--report', help='Output path (.json or .html)')
+    evaluate_parser.add_argument('--chunk-size', type=int, default=100000)
+    args = parser.parse_args()
+    
+    if args.command == 'evaluate':
+        evaluate_model(args.data, args.report, args.chunk_size)
+    else:
+        train_placement_model()
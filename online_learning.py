@@ -0,0 +1,243 @@
+# ============================================
+# Online Learning
+# Incremental model updates from reported placement outcomes
+# ============================================
+# Outcomes reported through unified_app.py are queued as row numbers into the
+# prediction store, once per prediction. A background thread periodically
+# takes the labels that arrived since the last update and refits the logistic
+# regression on them, warm-started from the live model and pulled toward it
+# by an L2 prior, so each update costs O(new labels) instead of a full
+# retrain. A fixed, hash-chosen share of rows is never trained on; an update
+# is only published if it does not worsen log loss on those held-out labels.
+# Outcomes are self-reported, so each user adds at most a few labels to any
+# one update. The refit model is published by swapping the registry's default
+# bundle in one assignment and saved atomically along with the version of the
+# base model it grew from, so restarts resume from the latest version until a
+# different base model is deployed.
+
+import copy
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from model_registry import ModelBundle
+
+# ============================================
+# SETTINGS
+# ============================================
+# Seconds between update attempts
+ONLINE_UPDATE_SECONDS = float(os.environ.get('ONLINE_UPDATE_SECONDS', 300))
+# New labels needed before an update runs
+ONLINE_MIN_LABELS = int(os.environ.get('ONLINE_MIN_LABELS', 50))
+# L2 strength pulling each update toward the live model's weights
+ONLINE_PRIOR_STRENGTH = float(os.environ.get('ONLINE_PRIOR_STRENGTH', 25.0))
+# Most recent labels whose held-out share the before/after log loss is measured on
+ONLINE_EVAL_WINDOW = int(os.environ.get('ONLINE_EVAL_WINDOW', 10000))
+# Share of labelled rows kept out of every fit and used only for evaluation
+ONLINE_HOLDOUT_FRACTION = float(os.environ.get('ONLINE_HOLDOUT_FRACTION', 0.2))
+# Most labels one user contributes to an update's training and evaluation sets (0 = no cap)
+ONLINE_MAX_LABELS_PER_USER = int(os.environ.get('ONLINE_MAX_LABELS_PER_USER', 3))
+
+NEWTON_ITERATIONS = 25
+
+
+def log_loss(model, Z, y):
+    """Mean logistic loss of a linear model on scaled features"""
+    logit = Z @ model.coef_[0] + model.intercept_[0]
+    # log(1 + e^s) - y*s, written to stay finite for large |s|
+    return float(np.mean(np.logaddexp(0.0, logit) - y * logit))
+
+
+def held_out(rows, fraction=ONLINE_HOLDOUT_FRACTION):
+    """
+    Mask of rows reserved for evaluation
+    A multiplicative hash of the row number decides, so a row is held out in
+    every update and after restarts, without storing the assignment
+    """
+    hashed = (np.asarray(rows, dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return hashed < np.uint64(int(fraction * 2 ** 32))
+
+
+def per_user_cap(users, cap=ONLINE_MAX_LABELS_PER_USER):
+    """Mask keeping each user's first cap rows, so no single reporter dominates a batch"""
+    users = np.asarray(users)
+    if cap <= 0 or not len(users):
+        return np.ones(len(users), dtype=bool)
+    order = np.argsort(users, kind='stable')
+    ordered = users[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    # Position of each row within its user's run of the sorted order
+    rank = np.arange(len(users)) - np.repeat(starts, np.diff(np.r_[starts, len(users)]))
+    keep = np.empty(len(users), dtype=bool)
+    keep[order] = rank < cap
+    return keep
+
+
+def proximal_update(model, Z, y, prior_strength=ONLINE_PRIOR_STRENGTH):
+    """
+    Warm-started logistic refit on a batch of scaled features Z and labels y
+    Minimizes sum(logloss) + prior_strength / 2 * ||theta - theta_live||^2 over
+    intercept and weights with Newton steps (a 6x6 system for this model), and
+    returns a copy of the model carrying the new parameters
+    """
+    theta_live = np.concatenate([model.intercept_, model.coef_[0]]).astype(np.float64)
+    Z1 = np.column_stack([np.ones(len(Z)), Z])
+    theta = theta_live.copy()
+    regularizer = prior_strength * np.eye(len(theta))
+    for _ in range(NEWTON_ITERATIONS):
+        p = 1.0 / (1.0 + np.exp(-(Z1 @ theta)))
+        gradient = Z1.T @ (p - y) + prior_strength * (theta - theta_live)
+        hessian = (Z1.T * (p * (1 - p))) @ Z1 + regularizer
+        step = np.linalg.solve(hessian, gradient)
+        theta -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+
+    updated = copy.deepcopy(model)
+    updated.intercept_ = theta[:1].copy()
+    updated.coef_ = theta[1:].reshape(1, -1).copy()
+    return updated
+
+
+class OnlineLearner:
+    """
+    Periodically folds new outcome labels into the default model
+
+    labels(start) must return (rows, users, X, y, total) for the labels queued
+    from position start on, where users identifies who each label belongs to,
+    X holds raw feature values and total is the queue length they were read up to.
+    """
+
+    def __init__(self, registry, labels, state_path, interval=ONLINE_UPDATE_SECONDS,
+                 min_labels=ONLINE_MIN_LABELS, prior_strength=ONLINE_PRIOR_STRENGTH,
+                 eval_window=ONLINE_EVAL_WINDOW, holdout_fraction=ONLINE_HOLDOUT_FRACTION,
+                 max_labels_per_user=ONLINE_MAX_LABELS_PER_USER):
+        self.registry = registry
+        # The deployed artifact updates grow from; a saved model is only reused on top of it
+        self.base_version = registry.default.version
+        self.labels = labels
+        self.state_path = state_path
+        self.interval = interval
+        self.min_labels = min_labels
+        self.prior_strength = prior_strength
+        self.eval_window = eval_window
+        self.holdout_fraction = holdout_fraction
+        self.max_labels_per_user = max_labels_per_user
+
+        self.lock = threading.Lock()  # one update at a time
+        self.consumed = 0
+        self.history = []
+        self.last_result = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    # ---------- persistence ----------
+    def restore(self):
+        """Load the last published model, if any, and make it the default"""
+        if not os.path.exists(self.state_path):
+            return False
+        state = joblib.load(self.state_path)
+        if state.get('base_version') != self.base_version:
+            # A new base model was deployed; updates to the old one no longer apply
+            print(f"⚠️ Discarding online model saved for base {state.get('base_version')}, "
+                  f"deployed base is {self.base_version}")
+            os.remove(self.state_path)
+            return False
+        default = self.registry.default
+        self.registry.default = ModelBundle(state['model'], state['scaler'], default.rules)
+        self.consumed = state['labels_used']
+        self.history = state['history']
+        return True
+
+    def _save(self, bundle):
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        temp_path = self.state_path + '.tmp'
+        joblib.dump({
+            'model': bundle.model,
+            'scaler': bundle.scaler,
+            'base_version': self.base_version,
+            'labels_used': self.consumed,
+            'history': self.history
+        }, temp_path)
+        # Readers see the old file or the new one, never a partial write
+        os.replace(temp_path, self.state_path)
+
+    # ---------- updates ----------
+    def update(self, force=False):
+        """Fold labels queued since the last update into the model; returns a result dict"""
+        with self.lock:
+            rows, users, X, y, total = self.labels(self.consumed)
+            train = ~held_out(rows, self.holdout_fraction)
+            eligible = train.sum()
+            train[train] = per_user_cap(users[train], self.max_labels_per_user)
+            # Compare out of sample: only held-out labels, which no update is ever fit on
+            eval_rows, eval_users, X_eval, y_eval, _ = self.labels(max(0, total - self.eval_window))
+            evaluate = held_out(eval_rows, self.holdout_fraction)
+            evaluate[evaluate] = per_user_cap(eval_users[evaluate], self.max_labels_per_user)
+            X_eval, y_eval = X_eval[evaluate], y_eval[evaluate]
+
+            result = {'new_labels': int(len(rows)), 'train_labels': int(train.sum()),
+                      'capped_labels': int(eligible - train.sum()), 'eval_labels': int(len(y_eval)),
+                      'at': time.time()}
+            if not train.any() or not len(y_eval) or (train.sum() < self.min_labels and not force):
+                result['status'] = 'waiting'
+                self.last_result = result
+                return result
+
+            live = self.registry.default
+            scaler = live.scaler
+            candidate = proximal_update(live.model, scaler.transform(X[train]), y[train], self.prior_strength)
+
+            Z_eval = scaler.transform(X_eval)
+            loss_before = log_loss(live.model, Z_eval, y_eval)
+            loss_after = log_loss(candidate, Z_eval, y_eval)
+            result.update(loss_before=round(loss_before, 5), loss_after=round(loss_after, 5))
+            self.consumed = total
+
+            if loss_after > loss_before:
+                result['status'] = 'rejected'
+                # Persist the new position so a restart does not refit on these labels
+                self._save(live)
+                self.last_result = result
+                return result
+
+            bundle = ModelBundle(candidate, scaler, live.rules)
+            result.update(status='published', previous_version=live.version, version=bundle.version)
+            self.history.append(result)
+            self._save(bundle)
+            # Atomic swap: requests read registry.default once and keep the bundle they got
+            self.registry.default = bundle
+            self.last_result = result
+            return result
+
+    # ---------- background thread ----------
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='online-learner', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.update()
+            except Exception as e:
+                print(f'❌ Online model update failed: {e}')
+
+    def close(self):
+        self.stop_event.set()
+
+    def status(self):
+        return {
+            'version': self.registry.default.version,
+            'labels_used': self.consumed,
+            'min_labels': self.min_labels,
+            'holdout_fraction': self.holdout_fraction,
+            'max_labels_per_user': self.max_labels_per_user,
+            'base_version': self.base_version,
+            'interval_seconds': self.interval,
+            'last_update': self.last_result,
+            'history': self.history[-20:]
+        }
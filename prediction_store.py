@@ -0,0 +1,264 @@
+# ============================================
+# Columnar Prediction Store
+# Array-backed storage for prediction records
+# ============================================
+# Each field is a NumPy column grown by doubling; user ids are interned to
+# integers and every user keeps an array of their row numbers. Model versions
+# are interned the same way (index 0 = unknown, for records older than the column). Records are
+# only turned back into dicts at the API boundary, so a stored prediction
+# costs a few dozen bytes instead of several hundred for a nested dict.
+# Appends serialize on one lock; per-user row lists are guarded by striped
+# locks so readers of different users never wait on each other.
+
+import threading
+import uuid
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+from striped_store import StripedLocks
+
+FEATURE_NAMES = ['cgpa', 'dsa_score', 'projects', 'communication', 'internships']
+INTEGER_FEATURES = ['dsa_score', 'projects', 'communication', 'internships']
+
+# column name -> dtype
+COLUMNS = {
+    'uuid': (np.uint8, 16),
+    'user': (np.uint32, None),
+    'created_at': (np.float64, None),
+    'cgpa': (np.float32, None),
+    'dsa_score': (np.int16, None),
+    'projects': (np.int16, None),
+    'communication': (np.int16, None),
+    'internships': (np.int16, None),
+    'placement_probability': (np.float32, None),
+    'readiness_score': (np.float32, None),
+    'model': (np.uint16, None),
+    'outcome': (np.uint8, None)
+}
+
+# Reported placement outcome per row
+OUTCOME_UNKNOWN, OUTCOME_NOT_PLACED, OUTCOME_PLACED = 0, 1, 2
+
+
+class PredictionStore:
+    """Append-only columnar store of prediction records"""
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.capacity = capacity
+        self.columns = {name: self._empty(name, capacity) for name in COLUMNS}
+        self.user_ids = []
+        self.user_index = {}
+        self.user_rows = []
+        self.model_versions = ['']
+        self.model_index = {'': 0}
+        self.lock = threading.Lock()
+        self.row_locks = StripedLocks()
+
+    @staticmethod
+    def _empty(name, capacity):
+        dtype, width = COLUMNS[name]
+        return np.zeros((capacity, width) if width else capacity, dtype=dtype)
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = self._empty(name, self.capacity)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def _intern_user(self, user_id):
+        index = self.user_index.get(user_id)
+        if index is None:
+            index = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.user_index[user_id] = index
+            self.user_rows.append(array('I'))
+        return index
+
+    def _intern_model(self, version):
+        index = self.model_index.get(version or '')
+        if index is None:
+            index = len(self.model_versions)
+            self.model_versions.append(version)
+            self.model_index[version] = index
+        return index
+
+    def __len__(self):
+        return self.size
+
+    # ---------- writes ----------
+    def append(self, record):
+        """Store a prediction record dict; returns its row number"""
+        with self.lock:
+            if self.size == self.capacity:
+                self._grow()
+            row = self.size
+            c = self.columns
+            user = self._intern_user(record['user_id'])
+            c['uuid'][row] = np.frombuffer(uuid.UUID(record['id']).bytes, dtype=np.uint8)
+            c['user'][row] = user
+            c['created_at'][row] = datetime.fromisoformat(record['created_at']).timestamp()
+            for feature in FEATURE_NAMES:
+                c[feature][row] = record['data'][feature]
+            c['placement_probability'][row] = record['placement_probability']
+            c['readiness_score'][row] = record['readiness_score']
+            c['model'][row] = self._intern_model(record.get('model_version'))
+            with self.row_locks.for_key(user):
+                self.user_rows[user].append(row)
+            # Publish the row only once every column is written
+            self.size = row + 1
+            return row
+
+    def rescore(self, rows, probabilities, model_version):
+        """Overwrite the probability and model version of existing rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        # Under the append lock so a concurrent _grow() cannot drop the writes
+        with self.lock:
+            self.columns['placement_probability'][rows] = probabilities
+            self.columns['model'][rows] = self._intern_model(model_version)
+
+    def set_outcome(self, row, placed):
+        """Set or overwrite a row's outcome; returns True if it had none before"""
+        with self.lock:
+            first = self.columns['outcome'][row] == OUTCOME_UNKNOWN
+            self.columns['outcome'][row] = OUTCOME_PLACED if placed else OUTCOME_NOT_PLACED
+            return bool(first)
+
+    # ---------- reads ----------
+    def column(self, name):
+        """View of a column over the stored rows"""
+        # Read size first: a concurrent _grow() only ever makes columns longer
+        size = self.size
+        return self.columns[name][:size]
+
+    def rows_for_user(self, user_id):
+        """Row numbers of a user's predictions in insertion order"""
+        index = self.user_index.get(user_id)
+        if index is None:
+            return np.zeros(0, dtype=np.uint32)
+        # Copy under the row lock: a view would pin the array's buffer and make
+        # the next append for this user fail with BufferError
+        with self.row_locks.for_key(index):
+            return np.array(self.user_rows[index], dtype=np.uint32)
+
+    def find(self, prediction_id, rows=None):
+        """Row number of a prediction id (searching only rows, if given), or None"""
+        try:
+            key = np.frombuffer(uuid.UUID(prediction_id).bytes, dtype=np.uint8)
+        except (TypeError, ValueError):
+            return None
+        ids = self.column('uuid')
+        candidates = np.arange(len(ids)) if rows is None else np.asarray(rows, dtype=np.int64)
+        match = np.flatnonzero((ids[candidates] == key).all(axis=1))
+        return int(candidates[match[0]]) if len(match) else None
+
+    def count_for_user(self, user_id):
+        index = self.user_index.get(user_id)
+        return 0 if index is None else len(self.user_rows[index])
+
+    def record(self, row):
+        """Materialize one row as the API's prediction dict"""
+        c = self.columns
+        data = {'cgpa': round(float(c['cgpa'][row]), 2)}
+        for feature in INTEGER_FEATURES:
+            data[feature] = int(c[feature][row])
+        return {
+            'id': str(uuid.UUID(bytes=c['uuid'][row].tobytes())),
+            'user_id': self.user_ids[c['user'][row]],
+            'data': data,
+            'placement_probability': round(float(c['placement_probability'][row]), 2),
+            'readiness_score': round(float(c['readiness_score'][row]), 2),
+            'model_version': self.model_versions[c['model'][row]] or None,
+            'outcome': None if c['outcome'][row] == OUTCOME_UNKNOWN else bool(c['outcome'][row] == OUTCOME_PLACED),
+            'created_at': datetime.fromtimestamp(c['created_at'][row]).isoformat()
+        }
+
+    def records(self, rows):
+        return [self.record(row) for row in rows]
+
+    def user_records(self, user_id, start=0, stop=None):
+        """Materialize a slice of a user's predictions"""
+        return self.records(self.rows_for_user(user_id)[start:stop])
+
+    # ---------- snapshots ----------
+    def state(self):
+        """Compact, picklable copy of the store"""
+        with self.lock:
+            size = self.size
+            return {
+                'columns': {name: column[:size].copy() for name, column in self.columns.items()},
+                'user_ids': list(self.user_ids),
+                'model_versions': list(self.model_versions)
+            }
+
+    @classmethod
+    def from_state(cls, state):
+        columns = state['columns']
+        size = len(columns['user'])
+        store = cls(capacity=max(1024, size))
+        for name, column in columns.items():
+            store.columns[name][:size] = column
+        store.size = size
+        for user_id in state['user_ids']:
+            store._intern_user(user_id)
+        # Snapshots taken before the model column existed leave it at 0 (unknown)
+        for version in state.get('model_versions', [''])[1:]:
+            store._intern_model(version)
+        # Rebuild per-user row lists with one stable sort instead of a Python loop
+        order = np.argsort(columns['user'], kind='stable').astype(np.uint32)
+        bounds = np.searchsorted(columns['user'][order], np.arange(len(store.user_ids) + 1))
+        for user, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            store.user_rows[user] = array('I', order[lo:hi].tobytes())
+        return store
+
+    def nbytes(self):
+        """Approximate memory held by the store"""
+        columns = sum(column.nbytes for column in self.columns.values())
+        rows = sum(r.buffer_info()[1] * r.itemsize for r in self.user_rows)
+        return {'columns': columns, 'user_rows': rows, 'rows': self.size, 'capacity': self.capacity}
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+def benchmark(n_records=1000000):
+    """Compare bytes per record between dict records and the columnar store"""
+    import tracemalloc
+
+    def make(i):
+        return {
+            'id': str(uuid.uuid4()),
+            'user_id': str(uuid.UUID(int=i % 10000)),
+            'data': {'cgpa': 8.1, 'dsa_score': 70 + i % 30, 'projects': 3,
+                     'communication': 7, 'internships': 1},
+            'placement_probability': round(50 + i % 50 * 0.97, 2),
+            'readiness_score': round(40 + i % 60 * 0.91, 2),
+            'created_at': datetime.now().isoformat()
+        }
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [make(i) for i in range(n_records)]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = PredictionStore()
+    for record in records:
+        store.append(record)
+    # Drop the growth slack so the figure reflects stored rows
+    store = PredictionStore.from_state(store.state())
+    columnar_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f'dict records:   {dict_bytes / n_records:.0f} bytes/record')
+    print(f'columnar store: {columnar_bytes / n_records:.0f} bytes/record '
+          f'(columns {store.nbytes()["columns"] / n_records:.0f}, capacity {store.capacity})')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,433 @@
+# ============================================
+# Resume Ingestion
+# Text extraction and feature detection for uploaded resumes
+# ============================================
+# Uploads are streamed to disk by the request thread, then parsed on a
+# bounded process pool so large or slow files never hold a request thread.
+# Supported formats: plain text, DOCX (zip + WordprocessingML) and PDFs with
+# a text layer (FlateDecode or uncompressed content streams). Scanned PDFs
+# and legacy .doc files have no extractable text and are rejected.
+
+import os
+import re
+import signal
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from striped_store import StripedDict
+
+# ============================================
+# SETTINGS
+# ============================================
+RESUME_WORKERS = int(os.environ.get('RESUME_WORKERS', 2))
+# Uploads queued or being parsed at once before new uploads get 503
+RESUME_QUEUE_DEPTH = int(os.environ.get('RESUME_QUEUE_DEPTH', 16))
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 5 * 1024 * 1024))
+# Most bytes a resume may decompress to (DOCX XML, PDF content streams)
+RESUME_MAX_EXPANDED_BYTES = int(os.environ.get('RESUME_MAX_EXPANDED_BYTES', 16 * 1024 * 1024))
+# Seconds a worker may spend parsing one resume before the job fails
+RESUME_JOB_TIMEOUT = float(os.environ.get('RESUME_JOB_TIMEOUT', 20))
+# Finished jobs are kept this long for polling
+RESUME_JOB_TTL = int(os.environ.get('RESUME_JOB_TTL', 3600))
+
+SUPPORTED_EXTENSIONS = {'.txt', '.docx', '.pdf'}
+COPY_CHUNK = 64 * 1024
+
+# Skills reported back to the user; matched as whole words, case-insensitive
+SKILL_KEYWORDS = [
+    'Python', 'Java', 'C++', 'C#', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Kotlin', 'SQL',
+    'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Django', 'Flask', 'Spring',
+    'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
+    'Git', 'Linux', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch',
+    'Pandas', 'NumPy', 'Data Structures', 'Algorithms', 'System Design', 'REST', 'GraphQL'
+]
+_SKILL_PATTERNS = [
+    (skill, re.compile(r'(?<![\w+#])' + re.escape(skill) + r'(?![\w+#])', re.IGNORECASE))
+    for skill in SKILL_KEYWORDS
+]
+
+# Section headings that start a block of project / experience entries
+_SECTION_HEADING = re.compile(
+    r'^\s*(projects?|academic projects|personal projects|experience|work experience|'
+    r'internships?|education|skills|technical skills|certifications?|achievements|'
+    r'activities|summary|objective|publications|awards|interests|languages)\s*:?\s*$',
+    re.IGNORECASE
+)
+_BULLET = re.compile(r'^\s*([•▪◦‣⁃*\-–]|\d+[.)])\s+')
+_CGPA = re.compile(r'\b(?:c\.?g\.?p\.?a|gpa)\b[^0-9\n]{0,20}(\d{1,2}(?:\.\d{1,2})?)(?:\s*/\s*(10|4(?:\.0)?))?',
+                   re.IGNORECASE)
+_INTERN = re.compile(r'\bintern(ship)?\b', re.IGNORECASE)
+
+
+class QueueFull(Exception):
+    """Raised when the resume queue is full"""
+
+
+class UnsupportedResume(ValueError):
+    """Raised for files whose text cannot be extracted"""
+
+
+class ResumeTimeout(Exception):
+    """Raised in a worker when parsing runs past the job deadline"""
+
+
+# ============================================
+# TEXT EXTRACTION (runs in worker processes)
+# ============================================
+def _too_large(limit):
+    return UnsupportedResume(f'Resume expands beyond {limit // (1024 * 1024)}MB')
+
+
+def extract_text_docx(path, limit=RESUME_MAX_EXPANDED_BYTES):
+    try:
+        with zipfile.ZipFile(path) as z:
+            # Read through a bounded stream: the header's file_size can lie
+            with z.open('word/document.xml') as member:
+                raw = member.read(limit + 1)
+    except (zipfile.BadZipFile, KeyError, NotImplementedError, RuntimeError, zlib.error):
+        raise UnsupportedResume('Not a valid DOCX file')
+    if len(raw) > limit:
+        raise _too_large(limit)
+    xml = raw.decode('utf-8', errors='ignore')
+    xml = re.sub(r'</w:p>|<w:br/>|<w:tab/>', '\n', xml)
+    text = re.sub(r'<[^>]+>', '', xml)
+    return (text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+                .replace('&quot;', '"').replace('&apos;', "'"))
+
+
+# Tokens of a content stream. Every alternative matches without backtracking
+# and an unterminated string ends at the next parenthesis, so scanning stays
+# linear on crafted input (unbalanced parentheses, runs of escapes)
+_PDF_TOKEN = re.compile(rb'\(((?:[^()\\]+|\\.)*)\)?|[\[\]]|[^\s()\[\]<>{}/%]+', re.DOTALL)
+_PDF_SHOW_OPS = {b'Tj', b'TJ', b"'", b'"'}
+_PDF_BREAK_OPS = {b'T*': '\n', b'ET': '\n', b'TD': '\n', b'Td': ' '}
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def _pdf_unescape(raw):
+    raw = re.sub(rb'\\([nrt()\\])', lambda m: _PDF_ESCAPES[m.group(1)], raw)
+    raw = re.sub(rb'\\([0-7]{1,3})', lambda m: bytes([int(m.group(1), 8) & 0xFF]), raw)
+    return raw.decode('latin-1')
+
+
+def _pdf_streams(data):
+    """(dictionary, body) of every stream object, found in one forward pass"""
+    pos = 0
+    while True:
+        keyword = data.find(b'stream', pos)
+        if keyword < 0:
+            return
+        start = keyword + len(b'stream')
+        if data.startswith(b'\r\n', start):
+            start += 2
+        elif data.startswith(b'\n', start):
+            start += 1
+        else:
+            pos = start  # 'endstream' or the word in other data
+            continue
+        header_end = data.rfind(b'>>', pos, keyword)
+        header_start = data.find(b'<<', pos, header_end) if header_end >= 0 else -1
+        if header_start < 0 or data[header_end + 2:keyword].strip():
+            pos = start
+            continue
+        end = data.find(b'endstream', start)
+        if end < 0:
+            return
+        body = data[start:end]
+        if body.endswith(b'\n'):
+            body = body[:-2] if body.endswith(b'\r\n') else body[:-1]
+        yield data[header_start:header_end + 2], body
+        pos = end + len(b'endstream')
+
+
+def _pdf_text(body, parts):
+    """Append the text shown by one content stream's operators to parts"""
+    operands = []  # strings since the last operator
+    in_array = False
+    for match in _PDF_TOKEN.finditer(body):
+        token = match.group()
+        if token[:1] == b'(':
+            operands.append(match.group(1))
+        elif token == b'[':
+            operands, in_array = [], True
+        elif token == b']':
+            in_array = False
+        elif not in_array:
+            if token in _PDF_SHOW_OPS:
+                parts.append(''.join(_pdf_unescape(s) for s in operands))
+            elif token in _PDF_BREAK_OPS:
+                parts.append(_PDF_BREAK_OPS[token])
+            operands = []
+
+
+def extract_text_pdf(path, limit=RESUME_MAX_EXPANDED_BYTES):
+    """Text operators from every content stream; enough for text-layer PDFs"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(b'%PDF'):
+        raise UnsupportedResume('Not a valid PDF file')
+
+    parts = []
+    budget = limit  # decompressed bytes left across all streams
+    for header, body in _pdf_streams(data):
+        if b'/Image' in header or b'/Length1' in header:
+            continue  # images and embedded fonts carry no text
+        if b'/FlateDecode' in header:
+            try:
+                body = zlib.decompressobj().decompress(body, budget + 1)
+            except zlib.error:
+                continue
+            if len(body) > budget:
+                raise _too_large(limit)
+            budget -= len(body)
+        elif b'/Filter' in header:
+            continue  # other encodings carry no text
+        _pdf_text(body, parts)
+    text = ''.join(parts)
+    if not text.strip():
+        raise UnsupportedResume('No text layer found in PDF (scanned documents are not supported)')
+    return text
+
+
+def extract_text(path, extension):
+    if extension == '.txt':
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', errors='ignore')
+    if extension == '.docx':
+        return extract_text_docx(path)
+    if extension == '.pdf':
+        return extract_text_pdf(path)
+    raise UnsupportedResume(f'Unsupported file type: {extension}')
+
+
+# ============================================
+# FEATURE DETECTION
+# ============================================
+def _sections(lines):
+    """Map lower-cased section heading -> lines until the next heading"""
+    sections = {}
+    current = None
+    for line in lines:
+        match = _SECTION_HEADING.match(line)
+        if match:
+            current = match.group(1).lower()
+            sections.setdefault(current, [])
+        elif current is not None and line.strip():
+            sections[current].append(line)
+    return sections
+
+
+def _count_entries(lines):
+    """
+    Entries in a section: title lines when the section mixes titles with
+    bullet details, otherwise one entry per bullet (or per line)
+    """
+    bullets = [l for l in lines if _BULLET.match(l)]
+    titles = [l for l in lines if not _BULLET.match(l) and len(l.strip()) <= 80]
+    if titles and bullets:
+        return len(titles)
+    return len(bullets) or len(lines)
+
+
+def detect_features(text):
+    """Placement features that can be read off a resume"""
+    lines = [l.rstrip() for l in text.splitlines()]
+    sections = _sections(lines)
+    features = {}
+
+    match = _CGPA.search(text)
+    if match:
+        value = float(match.group(1))
+        scale = float(match.group(2)) if match.group(2) else 10.0
+        if 0 < value <= scale:
+            features['cgpa'] = round(value * 10.0 / scale, 2)
+
+    project_lines = [l for name, body in sections.items() if 'project' in name for l in body]
+    if project_lines:
+        features['projects'] = _count_entries(project_lines)
+
+    intern_lines = [l for name, body in sections.items() if 'intern' in name for l in body]
+    if intern_lines:
+        features['internships'] = _count_entries(intern_lines)
+    else:
+        mentions = [l for l in lines if _INTERN.search(l) and not _SECTION_HEADING.match(l)]
+        if mentions or sections:
+            features['internships'] = len(mentions)
+
+    skills = [skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)]
+    return features, skills
+
+
+def parse_resume(path, extension):
+    """Worker entry point: extract text and detect features, then delete the upload"""
+    started = time.perf_counter()
+    try:
+        text = extract_text(path, extension)
+        features, skills = detect_features(text)
+        return {
+            'features': features,
+            'skills': skills,
+            'characters': len(text),
+            'parse_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _deadline_expired(signum, frame):
+    raise ResumeTimeout('Resume took too long to parse')
+
+
+def parse_resume_with_deadline(path, extension, timeout=RESUME_JOB_TIMEOUT):
+    """parse_resume, interrupted by a timer signal after timeout seconds.
+    Workers run jobs on their main thread, so the signal lands in the parser"""
+    previous = signal.signal(signal.SIGALRM, _deadline_expired)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_resume(path, extension)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# ============================================
+# UPLOADS AND JOBS (request side)
+# ============================================
+def save_stream(stream, path, max_bytes=RESUME_MAX_BYTES):
+    """Copy an upload stream to disk in chunks; returns the byte count"""
+    written = 0
+    with open(path, 'wb') as out:
+        while True:
+            chunk = stream.read(COPY_CHUNK)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                out.close()
+                os.remove(path)
+                raise ValueError(f'File exceeds {max_bytes // (1024 * 1024)}MB limit')
+            out.write(chunk)
+    return written
+
+
+class ResumeJobs:
+    """Parses saved uploads on a bounded process pool and tracks job state"""
+
+    def __init__(self, directory, workers=RESUME_WORKERS, queue_depth=RESUME_QUEUE_DEPTH,
+                 job_ttl=RESUME_JOB_TTL, max_bytes=RESUME_MAX_BYTES, job_timeout=RESUME_JOB_TIMEOUT):
+        self.directory = directory
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.job_ttl = job_ttl
+        self.job_timeout = job_timeout
+        self.slots = threading.BoundedSemaphore(queue_depth)
+        self.jobs = StripedDict()
+        self.lock = threading.Lock()
+        self.executor = None
+        self.last_prune = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_executor(self):
+        # Created lazily so forking servers start the pool after the fork
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('fork'))
+            return self.executor
+
+    def _discard_executor(self, executor):
+        """Drop a broken pool (a worker died) so the next submit starts a new one"""
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def upload_path(self, extension):
+        return os.path.join(self.directory, f'{uuid.uuid4().hex}{extension}')
+
+    def submit(self, user_id, path, filename, extension, size):
+        """Queue a saved upload for parsing; returns the job id"""
+        if not self.slots.acquire(blocking=False):
+            os.remove(path)
+            raise QueueFull('Resume processing queue is full, retry later')
+
+        job_id = str(uuid.uuid4())
+        job = {
+            'id': job_id,
+            'user_id': user_id,
+            'filename': filename,
+            'size': size,
+            'status': 'queued',
+            'created_at': time.time()
+        }
+        self.jobs[job_id] = job
+        self._prune()
+
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(parse_resume_with_deadline, path, extension, self.job_timeout)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(parse_resume_with_deadline, path, extension, self.job_timeout)
+        except BaseException:
+            self.slots.release()
+            self.jobs.pop(job_id)
+            raise
+        job['status'] = 'processing'
+        future.add_done_callback(lambda f: self._finish(job, f, executor, path))
+        return job_id
+
+    def _finish(self, job, future, executor, path):
+        try:
+            result = future.result()
+            job.update(result, status='done')
+        except (UnsupportedResume, ResumeTimeout) as e:
+            job.update(status='failed', error=str(e))
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            job.update(status='failed', error='Resume worker stopped unexpectedly, please upload again')
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        except Exception as e:
+            job.update(status='failed', error=f'Could not parse resume: {e}')
+        finally:
+            job['finished_at'] = time.time()
+            self.slots.release()
+
+    def get(self, job_id, user_id):
+        """The job if it belongs to user_id"""
+        job = self.jobs.get(job_id)
+        if job is None or job['user_id'] != user_id:
+            return None
+        return job
+
+    def _prune(self):
+        now = time.time()
+        with self.lock:
+            if now - self.last_prune < 60:
+                return
+            self.last_prune = now
+        self.jobs.prune(lambda _, job: job.get('finished_at', now) < now - self.job_ttl)
+
+    def stats(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'jobs': counts}
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
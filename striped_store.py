@@ -0,0 +1,335 @@
+# ============================================
+# Striped Stores
+# Thread-safe dicts for the in-memory stores in unified_app.py
+# ============================================
+# Keys are spread over a fixed number of stripes, each a plain dict with its
+# own lock, so request threads working on different users or tokens rarely
+# wait on each other. Compound operations such as check-then-insert run under
+# the key's stripe lock via insert_if_absent() or lock_for().
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+STORE_STRIPES = int(os.environ.get('STORE_STRIPES', 64))
+
+
+class StripedLocks:
+    """A fixed pool of locks picked by key hash"""
+
+    def __init__(self, stripes=STORE_STRIPES):
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def for_key(self, key):
+        return self.locks[hash(key) % len(self.locks)]
+
+
+class StripedDict:
+    """Dict sharded over independently locked stripes"""
+
+    def __init__(self, stripes=STORE_STRIPES):
+        self.shards = [{} for _ in range(stripes)]
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def _index(self, key):
+        return hash(key) % len(self.shards)
+
+    # ---------- single-key operations ----------
+    def get(self, key, default=None):
+        i = self._index(key)
+        with self.locks[i]:
+            return self.shards[i].get(key, default)
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        with self.locks[i]:
+            return self.shards[i][key]
+
+    def __setitem__(self, key, value):
+        i = self._index(key)
+        with self.locks[i]:
+            self.shards[i][key] = value
+
+    def __delitem__(self, key):
+        i = self._index(key)
+        with self.locks[i]:
+            del self.shards[i][key]
+
+    def __contains__(self, key):
+        i = self._index(key)
+        with self.locks[i]:
+            return key in self.shards[i]
+
+    def pop(self, key, default=None):
+        i = self._index(key)
+        with self.locks[i]:
+            return self.shards[i].pop(key, default)
+
+    def insert_if_absent(self, key, value):
+        """Atomically insert value unless key exists; returns True if inserted"""
+        i = self._index(key)
+        with self.locks[i]:
+            shard = self.shards[i]
+            if key in shard:
+                return False
+            shard[key] = value
+            return True
+
+    @contextmanager
+    def lock_for(self, key):
+        """Hold the key's stripe lock and work on its shard directly"""
+        i = self._index(key)
+        with self.locks[i]:
+            yield self.shards[i]
+
+    # ---------- whole-store operations ----------
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def items(self):
+        """Snapshot of all items, each stripe copied under its own lock"""
+        result = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result.extend(shard.items())
+        return result
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def snapshot(self):
+        return dict(self.items())
+
+    def update(self, mapping):
+        for key, value in mapping.items():
+            self[key] = value
+
+    def prune(self, predicate):
+        """Remove every item for which predicate(key, value) is true; returns the count"""
+        removed = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                stale = [key for key, value in shard.items() if predicate(key, value)]
+                for key in stale:
+                    del shard[key]
+                removed += len(stale)
+        return removed
+
+
+class BoundedCache:
+    """
+    LRU cache bounded by the total size of its entries
+    For derived data that can be rebuilt on a miss; the caller states each
+    entry's size, and an entry larger than the whole budget is not kept
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (size, value), least recently used first
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry[1]
+
+    def put(self, key, value, size):
+        with self.lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (size, value)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (evicted, _) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.counters['evictions'] += 1
+
+    def pop(self, key):
+        with self.lock:
+            self._discard(key)
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[0]
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, entries=len(self.entries), bytes=self.nbytes, max_bytes=self.max_bytes)
+
+
+# ============================================
+# STRESS TEST
+# ============================================
+def stress_test(n_threads=16, n_ops=20000):
+    """
+    Hammer the stores from many threads and check the invariants:
+    exactly one winner per contested key, no lost updates, and prediction
+    rows readable while the same users are being appended to
+    """
+    import random
+    import time
+    import uuid
+    from datetime import datetime
+
+    from prediction_store import PredictionStore
+
+    # 1. Check-then-insert: every thread tries to claim the same emails
+    emails = StripedDict()
+    winners = [0] * n_threads
+    barrier = threading.Barrier(n_threads)
+
+    def claim(t):
+        barrier.wait()
+        for i in range(n_ops // 10):
+            if emails.insert_if_absent(f'user{i}@example.com', t):
+                winners[t] += 1
+
+    threads = [threading.Thread(target=claim, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(winners) == len(emails) == n_ops // 10, (sum(winners), len(emails))
+    print(f'insert_if_absent: {n_ops // 10} keys, {n_threads} threads, one winner each')
+
+    # 2. Read-modify-write under lock_for: no lost increments
+    counters = StripedDict()
+
+    def bump(t):
+        rng = random.Random(t)
+        for _ in range(n_ops):
+            key = rng.randrange(256)
+            with counters.lock_for(key) as shard:
+                shard[key] = shard.get(key, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=bump, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    assert sum(counters.values()) == n_threads * n_ops
+    print(f'lock_for increments: {n_threads * n_ops} updates, none lost, '
+          f'{elapsed / (n_threads * n_ops) * 1e6:.2f} us/update')
+
+    # 3. Prediction appends racing per-user reads
+    store = PredictionStore()
+    users = [str(uuid.UUID(int=u)) for u in range(32)]
+    stop = threading.Event()
+    errors = []
+
+    def writer(t):
+        rng = random.Random(t)
+        for _ in range(n_ops // 4):
+            store.append({
+                'id': str(uuid.uuid4()), 'user_id': rng.choice(users),
+                'data': {'cgpa': 8.0, 'dsa_score': 70, 'projects': 3, 'communication': 7, 'internships': 1},
+                'placement_probability': 80.0, 'readiness_score': 65.0,
+                'created_at': datetime.now().isoformat()
+            })
+
+    def reader(t):
+        rng = random.Random(t)
+        try:
+            while not stop.is_set():
+                user = rng.choice(users)
+                rows = store.rows_for_user(user)
+                if len(rows):
+                    store.column('readiness_score')[rows].mean()
+                    store.record(int(rows[-1]))
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=reader, args=(t,)) for t in range(n_threads // 2)]
+    writers = [threading.Thread(target=writer, args=(t,)) for t in range(n_threads // 2)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+    total = (n_threads // 2) * (n_ops // 4)
+    assert not errors, errors[:3]
+    assert len(store) == total == sum(store.count_for_user(u) for u in users)
+    assert sorted(int(r) for u in users for r in store.rows_for_user(u)) == list(range(total))
+    print(f'prediction store: {total} appends racing {n_threads // 2} readers, all rows accounted for')
+
+    # 4. Keyed and ordered log writes racing snapshots, then recovery
+    import shutil
+    import tempfile
+
+    from store_log import DurableLog
+
+    directory = tempfile.mkdtemp(prefix='stress_log_')
+
+    def fresh_log():
+        state = {'users': {}, 'rows': []}
+
+        def apply(op):
+            if op[0] == 'user':
+                state['users'][op[1]] = op[2]
+            else:
+                state['rows'].append(op[1])
+
+        def restore(snapshot):
+            state['users'] = dict(snapshot['users'])
+            state['rows'] = list(snapshot['rows'])
+
+        log = DurableLog(directory, apply, lambda: {'users': dict(state['users']), 'rows': list(state['rows'])},
+                         restore, snapshot_every=0, sync=False)
+        return log, state
+
+    log, state = fresh_log()
+    log.recover()
+
+    def keyed(t):
+        for i in range(n_ops // 10):
+            log.record(['user', f'{t}-{i}', i], key=f'{t}-{i}')
+
+    def ordered():
+        for b in range(n_ops // 200):
+            log.record_many([['row', b * 100 + i] for i in range(100)])
+
+    def snapshots():
+        for _ in range(5):
+            log.snapshot()
+            time.sleep(0.01)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=keyed, args=(t,)) for t in range(n_threads)]
+    threads += [threading.Thread(target=ordered), threading.Thread(target=snapshots)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    log.close()
+    expected = (dict(state['users']), list(state['rows']))
+
+    log, state = fresh_log()
+    log.recover()
+    log.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    assert (state['users'], state['rows']) == expected
+    assert state['rows'] == list(range(len(state['rows'])))
+    print(f'store log: {len(expected[0])} keyed + {len(expected[1])} ordered records with 5 snapshots '
+          f'in {elapsed:.2f}s, recovered identically')
+
+
+if __name__ == '__main__':
+    stress_test()
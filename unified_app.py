@@ -4,16 +4,45 @@
 # All from a single URL
 # ============================================
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import joblib
 import numpy as np
 import pandas as pd
 import os
+import sys
 import hashlib
+import hmac
+import base64
+import secrets
+import time
 import uuid
 from datetime import datetime, timedelta
 import json
+import csv
+import io
+import zlib
+import atexit
+import threading
+from cohort_index import CohortIndex
+from store_log import DurableLog
+from write_behind import WriteBehindQueue, QueueFull
+from prediction_store import PredictionStore, OUTCOME_PLACED, OUTCOME_NOT_PLACED
+from striped_store import StripedDict, BoundedCache
+from background_job import BackgroundJob
+from resume_ingest import ResumeJobs, save_stream, SUPPORTED_EXTENSIONS, RESUME_MAX_BYTES, QueueFull as ResumeQueueFull
+
+# Serving helpers shared with the standalone ML API
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml-model'))
+from admission import AdmissionController, client_key
+from singleflight import SingleFlight
+from drift import DriftMonitor
+from scoring_rules import ScoringRules
+from inference_pool import score_matrix
+from tracing import RequestTracer
+from admin import admin_required, is_admin
+from model_registry import ModelRegistry, ModelBundle, TENANT_HEADER, valid_tenant
+from online_learning import OnlineLearner
 
 # ============================================
 # APP CONFIGURATION
@@ -24,15 +53,159 @@ app = Flask(__name__, static_folder='client/build')
 # Enable CORS for development
 CORS(app)
 
-# Secret key for sessions
-app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
+# Largest request body Werkzeug reads. Without it multipart uploads (including
+# chunked ones with no Content-Length) are spooled in full before any route
+# code runs; the default leaves room for form overhead around a resume
+MAX_REQUEST_BYTES = int(os.environ.get('MAX_REQUEST_BYTES', RESUME_MAX_BYTES + 64 * 1024))
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({'error': f'Request body exceeds {MAX_REQUEST_BYTES // 1024}KB limit'}), 413
+
+# Secret key for signing auth tokens. Without SECRET_KEY a random per-process
+# key is used: tokens stay unforgeable but do not survive a restart
+app.secret_key = os.environ.get('SECRET_KEY', '')
+if not app.secret_key:
+    app.secret_key = secrets.token_hex(32)
+    print("⚠️ SECRET_KEY is not set; using a random key, so tokens are invalidated on restart")
+
+# Load shedding in front of /api/predict (see ml-model/admission.py)
+admission = AdmissionController()
+
+# Identical prediction profiles in flight share one computation
+coalescer = SingleFlight()
+
+# Recent and slowest requests with stage timings, served by /debug/slow
+tracer = RequestTracer().init_app(app)
 
 # ============================================
 # IN-MEMORY DATABASE (Replace with MongoDB in production)
 # ============================================
-users_db = {}
-predictions_db = []
-sessions_db = {}
+# Stores shared by request threads are lock-striped dicts (see striped_store.py)
+users_db = StripedDict()
+# email -> user id; also makes the uniqueness check in register() atomic
+users_by_email = StripedDict()
+
+# Signed tokens carry their own user and expiry (see generate_token), so no
+# session table is needed; this only holds revoked token ids until they expire.
+# Like every store here it is per process: one process owns DATA_DIR
+revoked_tokens = StripedDict()
+
+# Columnar prediction records with a per-user row index (see prediction_store.py)
+# Dicts are only materialized at the API boundary
+predictions_db = PredictionStore()
+
+# Rows whose outcome was reported, in order of their first report (each row
+# appears once); the online learner consumes them from the position it reached
+outcome_rows = []
+
+# Cohort percentiles and leaderboards, updated on every prediction
+COHORT_METRICS = ['readiness_score', 'placement_probability']
+LEADERBOARD_MAX_K = 100
+cohort_index = CohortIndex(COHORT_METRICS, leaderboard_size=LEADERBOARD_MAX_K)
+
+# Per-user write counter, bumped by apply_op whenever the user or their predictions change
+user_versions = StripedDict()
+# user id -> (version, serialized /api/dashboard body); stale once the version moves on.
+# Least recently viewed dashboards are evicted past DASHBOARD_CACHE_BYTES
+DASHBOARD_CACHE_BYTES = int(os.environ.get('DASHBOARD_CACHE_BYTES', 64 * 1024 * 1024))
+dashboard_cache = BoundedCache(DASHBOARD_CACHE_BYTES)
+
+# ============================================
+# DURABILITY (append-only log + snapshots, see store_log.py)
+# ============================================
+# Every mutation goes through store_log.record() so it is applied in memory
+# and appended to the log in the same order; startup replays the latest
+# snapshot plus the log tail. User and revocation ops are keyed (they commute
+# across keys) so they never queue behind a batch of predictions; prediction,
+# outcome and re-score ops share the ordered lane because they refer to rows
+DATA_DIR = os.environ.get('DATA_DIR', 'data')
+STORE_SYNC = os.environ.get('STORE_SYNC', 'true').lower() == 'true'
+SNAPSHOT_EVERY = int(os.environ.get('SNAPSHOT_EVERY', 100000))
+
+def apply_op(op):
+    """Apply one logged mutation to the in-memory stores"""
+    kind = op[0]
+    if kind == 'user':
+        user = op[1]
+        users_db[user['id']] = user
+        users_by_email[user['email']] = user['id']
+        touch_user(user['id'])
+    elif kind == 'revoke':
+        revoked_tokens[op[1]] = op[2]
+    elif kind == 'prediction':
+        record = op[1]
+        predictions_db.append(record)
+        cohort_index.add(record['user_id'], record)
+        touch_user(record['user_id'])
+    elif kind == 'rescore':
+        _, rows, probabilities, model_version = op
+        predictions_db.rescore(rows, probabilities, model_version)
+        for user in np.unique(predictions_db.column('user')[rows]):
+            touch_user(predictions_db.user_ids[user])
+    elif kind == 'cohort_rebuild':
+        rebuild_cohort()
+    elif kind == 'outcome':
+        _, row, placed = op
+        # A row is queued for the learner once; a later report only corrects its value
+        if predictions_db.set_outcome(row, placed):
+            outcome_rows.append(row)
+        touch_user(predictions_db.user_ids[predictions_db.column('user')[row]])
+
+def touch_user(user_id):
+    """Bump the user's write version and drop their cached dashboard"""
+    with user_versions.lock_for(user_id) as shard:
+        shard[user_id] = shard.get(user_id, 0) + 1
+    dashboard_cache.pop(user_id)
+
+def store_state():
+    """Point-in-time copy of the stores for a snapshot"""
+    return {
+        'users': users_db.snapshot(),
+        'revoked': {jti: exp for jti, exp in revoked_tokens.items() if exp > time.time()},
+        'predictions': predictions_db.state(),
+        'outcome_rows': list(outcome_rows)
+    }
+
+def restore_state(state):
+    """Load a snapshot and rebuild the derived indexes"""
+    global predictions_db
+    users_db.update(state['users'])
+    users_by_email.update({user['email']: user_id for user_id, user in state['users'].items()})
+    revoked_tokens.update(state.get('revoked', {}))
+    predictions_db = PredictionStore.from_state(state['predictions'])
+    outcome_rows[:] = state.get('outcome_rows', [])
+    rebuild_cohort()
+
+def rebuild_cohort():
+    """Recompute cohort percentiles and leaderboards from the stored predictions"""
+    cohort_index.rebuild(
+        predictions_db.user_ids,
+        predictions_db.column('user'),
+        {m: predictions_db.column(m) for m in COHORT_METRICS}
+    )
+
+store_log = DurableLog(DATA_DIR, apply_op, store_state, restore_state,
+                       snapshot_every=SNAPSHOT_EVERY, sync=STORE_SYNC).recover()
+atexit.register(store_log.close)
+
+# Prediction records are persisted write-behind: /api/predict queues them and
+# a background thread applies and logs them in batches (see write_behind.py),
+# so the request does not wait for storage. A full queue returns 503.
+WRITE_QUEUE_DEPTH = int(os.environ.get('WRITE_QUEUE_DEPTH', 10000))
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 500))
+WRITE_QUEUE_TIMEOUT = float(os.environ.get('WRITE_QUEUE_TIMEOUT', 0.5))
+prediction_writer = WriteBehindQueue(store_log.record_many, max_depth=WRITE_QUEUE_DEPTH,
+                                     batch_size=WRITE_BATCH_SIZE, put_timeout=WRITE_QUEUE_TIMEOUT,
+                                     name='prediction-writer')
+# atexit runs in reverse order: drain the queue before the log closes
+atexit.register(prediction_writer.close)
+
+# Uploaded resumes are parsed on a bounded process pool (see resume_ingest.py)
+resume_jobs = ResumeJobs(os.path.join(DATA_DIR, 'uploads'))
+atexit.register(resume_jobs.close)
 
 # ============================================
 # LOAD ML MODEL
@@ -84,15 +257,76 @@ FEATURE_LABELS = {
     'communication': 'Communication',
     'internships': 'Internships'
 }
+# Accepted input range per feature; stored features use compact dtypes (see prediction_store.py)
+FEATURE_RANGES = {
+    'cgpa': (0, 10),
+    'dsa_score': (0, 100),
+    'projects': (0, 1000),
+    'communication': (0, 10),
+    'internships': (0, 1000)
+}
+
+# Live input distributions compared against the training data
+DATASET_PATH = find_file(['dataset.csv', 'ml-model/dataset.csv'])
+drift_monitor = DriftMonitor(FEATURE_NAMES, DATASET_PATH)
+
+# Ideals, scales, readiness weights and tier thresholds (ml-model/scoring_rules.json)
+scoring_rules = ScoringRules.load()
+if scoring_rules.features != FEATURE_NAMES:
+    raise RuntimeError(f"Scoring rules features {scoring_rules.features} do not match the model's {FEATURE_NAMES}")
 
 # Ideal skill values for gap analysis
-IDEAL_SKILLS = {
-    'dsa_score': 70,
-    'communication': 7,
-    'projects': 3,
-    'internships': 2,
-    'cgpa': 8.0
-}
+IDEAL_SKILLS = scoring_rules.ideals()
+# Features whose skill gap is reported as a count rather than points of the scale
+COUNT_FEATURES = ['projects', 'internships']
+COUNT_FEATURE_MASK = np.isin(FEATURE_NAMES, COUNT_FEATURES)
+
+# Per-tenant models (see ml-model/model_registry.py), loaded on first use;
+# users without a tenant model get the default one above
+model_registry = ModelRegistry(ModelBundle(model, scaler, scoring_rules), len(FEATURE_NAMES))
+
+def tenant_for(user):
+    """The tenant claim from the user's token, else the X-Tenant-ID header"""
+    return user.get('tenant') or request.headers.get(TENANT_HEADER)
+
+def row_tenants(rows):
+    """
+    Tenant whose model scored each prediction row (None for the default model),
+    read from the row's stored model version so header-routed rows count too.
+    Rows stored without a version fall back to the user's tenant claim
+    """
+    index = predictions_db.column('model')[rows]
+    names = np.array([v.partition('@')[0] for v in predictions_db.model_versions], dtype=object)
+    tenants = names[index]
+    tenants[tenants == 'default'] = None
+    unknown = tenants == ''
+    if unknown.any():
+        users = predictions_db.column('user')[rows][unknown]
+        claims = {u: (users_db.get(predictions_db.user_ids[u]) or {}).get('tenant') for u in np.unique(users)}
+        tenants[unknown] = [claims[u] for u in users]
+    return tenants
+
+def outcome_labels(start):
+    """
+    Reported outcomes from queue position start on, as (rows, users, X, y, total)
+    Only rows scored by the default model count; tenant models train on their own data
+    """
+    total = len(outcome_rows)
+    rows = np.array(outcome_rows[start:total], dtype=np.int64)
+    rows = rows[np.equal(row_tenants(rows), None)]
+    users = predictions_db.column('user')[rows]
+    X = np.column_stack([predictions_db.column(f)[rows] for f in FEATURE_NAMES]).astype(np.float64)
+    y = (predictions_db.column('outcome')[rows] == OUTCOME_PLACED).astype(np.float64)
+    return rows, users, X, y, total
+
+# Reported outcomes periodically refine the default model (see online_learning.py);
+# the latest published version is saved in DATA_DIR and reloaded on startup
+online_learner = OnlineLearner(model_registry, outcome_labels, os.path.join(DATA_DIR, 'online_model.joblib'))
+if model is not None:
+    if online_learner.restore():
+        print(f"✅ Online model restored: {model_registry.default.version}")
+    online_learner.start()
+    atexit.register(online_learner.close)
 
 # ============================================
 # HELPER FUNCTIONS
@@ -101,113 +335,150 @@ def hash_password(password):
     """Hash password using SHA256"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-def generate_token():
-    """Generate a unique session token"""
-    return str(uuid.uuid4())
+TOKEN_TTL = int(os.environ.get('TOKEN_TTL_SECONDS', 7 * 24 * 3600))
+# Claims every token must carry as strings (exp is an int)
+TOKEN_STR_CLAIMS = ('sub', 'name', 'email', 'created_at', 'jti')
 
-def get_user_by_token(token):
-    """Get user from session token"""
-    if token in sessions_db:
-        user_id = sessions_db[token]
-        return users_db.get(user_id)
-    return None
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
 
-def calculate_readiness_score(data):
-    """Calculate comprehensive readiness score"""
-    weights = {
-        'cgpa': 0.25,
-        'dsa_score': 0.25,
-        'projects': 0.20,
-        'communication': 0.15,
-        'internships': 0.15
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def _sign(payload):
+    return _b64encode(hmac.new(app.secret_key.encode(), payload.encode(), hashlib.sha256).digest())
+
+def generate_token(user):
+    """
+    Generate an HMAC-signed, expiring token
+    The payload carries the user's public fields, so verifying it needs no
+    session table; revocation (see logout) is tracked in this process only
+    """
+    claims = {
+        'sub': user['id'],
+        'name': user['name'],
+        'email': user['email'],
+        'created_at': user['created_at'],
+        'exp': int(time.time()) + TOKEN_TTL,
+        'jti': uuid.uuid4().hex
     }
-    
-    normalized = {
-        'cgpa': min(data['cgpa'] / 10.0, 1.0),
-        'dsa_score': min(data['dsa_score'] / 100.0, 1.0),
-        'projects': min(data['projects'] / 5.0, 1.0),
-        'communication': min(data['communication'] / 10.0, 1.0),
-        'internships': min(data['internships'] / 3.0, 1.0)
+    if user.get('tenant'):
+        claims['tenant'] = user['tenant']
+    payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+    return f'{payload}.{_sign(payload)}'
+
+def verify_token(token):
+    """Return the token's claims if the signature is valid and it has not expired or been revoked"""
+    try:
+        payload, signature = token.split('.')
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError):  # TypeError: non-ASCII signature
+        return None
+    # Only tokens from generate_token() are accepted, whatever else the key has signed
+    if not isinstance(claims, dict) or not all(isinstance(claims.get(k), str) for k in TOKEN_STR_CLAIMS) \
+            or not isinstance(claims.get('exp'), int) or not isinstance(claims.get('tenant', ''), str):
+        return None
+    if claims['exp'] < time.time() or claims['jti'] in revoked_tokens:
+        return None
+    return claims
+
+def get_user_by_token(token):
+    """Get user from a signed token"""
+    claims = verify_token(token)
+    if claims is None:
+        return None
+    # Fall back to the claims if the user record is gone (e.g. DATA_DIR was reset)
+    return users_db.get(claims['sub']) or {
+        'id': claims['sub'],
+        'name': claims['name'],
+        'email': claims['email'],
+        'created_at': claims['created_at'],
+        'tenant': claims.get('tenant')
     }
-    
-    score = sum(normalized[k] * weights[k] for k in weights) * 100
-    return round(score, 2)
 
-def get_recommendation_level(score):
-    """Get recommendation level based on score"""
-    if score >= 75:
-        return {
-            'level': 'Strong Candidate',
-            'color': '#4ade80',
-            'icon': '🎯',
-            'message': 'Excellent profile! You are well-prepared for placements.',
-            'urgency': 'Low'
-        }
-    elif score >= 50:
-        return {
-            'level': 'Moderate',
-            'color': '#fbbf24',
-            'icon': '⚡',
-            'message': 'Good progress! Focus on improving weak areas.',
-            'urgency': 'Medium'
-        }
-    else:
-        return {
-            'level': 'High Risk',
-            'color': '#f87171',
-            'icon': '🚨',
-            'message': 'Immediate action needed! Work on skill gaps.',
-            'urgency': 'High'
-        }
+def admission_key():
+    """Per-client admission key: the verified token's user, else the client address"""
+    claims = verify_token(request.headers.get('Authorization', '').replace('Bearer ', ''))
+    return f"user:{claims['sub']}" if claims else client_key()
+
+# Write versions restart on every boot (they are not in snapshots), so ETags
+# also carry a per-process id: a restart invalidates every ETag issued before it
+BOOT_ID = uuid.uuid4().hex
+
+def user_etag(user_id):
+    """
+    ETag for a response derived from the user's data
+    Combines the boot id and the user's write version with the request path
+    and query, so it changes whenever apply_op records a write for the user
+    """
+    version = user_versions.get(user_id, 0)
+    return hashlib.sha1(f'{BOOT_ID}:{user_id}:{version}:{request.full_path}'.encode()).hexdigest()[:24]
+
+def not_modified(etag):
+    """True if the client's If-None-Match already holds this ETag"""
+    return request.if_none_match.contains(etag)
+
+def with_etag(response, etag):
+    # no-cache: browsers may keep the body but must revalidate on every poll
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def since_cursor(since, total):
+    """
+    Start row for a ?since= cursor (the 'cursor' of an earlier response, i.e. how
+    many of the user's predictions the client already has); returns (start, delta)
+    A cursor past the end (e.g. after a restore) falls back to a full response
+    """
+    if since is None or since < 0 or since > total:
+        return 0, False
+    return since, True
+
+def score_profile(data, placement_probability=None):
+    """Evaluate the scoring rules for one profile (probability in percent)"""
+    return scoring_rules.evaluate(
+        scoring_rules.matrix(data),
+        None if placement_probability is None else [placement_probability]
+    )
+
+def calculate_readiness_score(data, scoring=None):
+    """Calculate comprehensive readiness score"""
+    if scoring is None:
+        scoring = score_profile(data)
+    return round(float(scoring['readiness_score'][0]), 2)
 
-def analyze_skill_gaps(data):
+def get_recommendation_level(scoring):
+    """Get recommendation level based on readiness score"""
+    return scoring_rules.level('readiness_level', scoring)
+
+def analyze_skill_gaps(data, scoring=None):
     """Analyze skill gaps and provide recommendations"""
+    if scoring is None:
+        scoring = score_profile(data)
+    skill_pct = scoring['skill_pct'][0]
+    # Shortfall in points of each feature's scale, except for counts (projects,
+    # internships), whose gap stays in units: the roadmap thresholds expect that
+    shortfall = scoring['shortfall'][0]
+    gap_points = np.where(COUNT_FEATURE_MASK, shortfall, shortfall * scoring_rules.pct_per_unit)
+    status_index = scoring['skill_status'][0]
+    severity_index = scoring['gap_severity'][0]
+    
     gaps = {}
     skill_gaps_list = []
     scores = {}
     ideal_scores = {}
     
-    for feature in FEATURE_NAMES:
-        ideal = IDEAL_SKILLS.get(feature, 0)
+    for i, feature in enumerate(FEATURE_NAMES):
+        ideal = IDEAL_SKILLS[feature]
         actual = data.get(feature, 0)
-        
-        if feature == 'cgpa':
-            gap = max(0, (ideal - actual) / 10.0 * 100)
-            score = min(100, (actual / 10.0) * 100)
-            ideal_score = 80  # 8.0 CGPA = 80%
-        elif feature == 'dsa_score':
-            gap = max(0, ideal - actual)
-            score = min(100, actual)
-            ideal_score = 70
-        elif feature == 'communication':
-            gap = max(0, (ideal - actual) / 10.0 * 100)
-            score = min(100, (actual / 10.0) * 100)
-            ideal_score = 70
-        elif feature == 'projects':
-            gap = max(0, ideal - actual)
-            score = min(100, (actual / 5.0) * 100)
-            ideal_score = 60
-        else:  # internships
-            gap = max(0, ideal - actual)
-            score = min(100, (actual / 3.0) * 100)
-            ideal_score = 67
-        
-        if score >= 80:
-            status = 'Strong'
-            severity = 'Low'
-        elif score >= 60:
-            status = 'Good'
-            severity = 'Low'
-        elif score >= 40:
-            status = 'Average'
-            severity = 'Medium'
-        else:
-            status = 'Needs Work'
-            severity = 'High'
+        score = float(skill_pct[i])
+        gap = float(gap_points[i])
         
         gaps[feature] = {
             'score': round(score, 1),
-            'status': status,
+            'status': scoring_rules.tiers['skill_status'].level(status_index[i])['status'],
             'gap': round(gap, 1),
             'ideal': ideal,
             'actual': actual
@@ -215,7 +486,7 @@ def analyze_skill_gaps(data):
         
         # Add to scores dict for chart
         scores[feature] = round(score, 1)
-        ideal_scores[feature] = ideal_score
+        ideal_scores[feature] = round(float(scoring_rules.ideal_pct[i]))
         
         # Add to skill_gaps list for Dashboard component
         skill_gaps_list.append({
@@ -223,7 +494,7 @@ def analyze_skill_gaps(data):
             'current': actual,
             'ideal': ideal,
             'gap': round(gap, 1),
-            'severity': severity
+            'severity': scoring_rules.tiers['gap_severity'].level(severity_index[i])['severity']
         })
     
     return gaps, scores, ideal_scores, skill_gaps_list
@@ -301,6 +572,57 @@ def generate_roadmap(gaps):
     
     return roadmap[:7]  # Return max 7 tasks
 
+def downsample_lttb(x, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previous pick and the next bucket's mean
+    Returns the indices of the kept points
+    """
+    n = len(x)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = [0]
+    prev = 0
+    for b in range(max_points - 2):
+        start, end = edges[b], edges[b + 1]
+        next_end = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) -
+                      (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected.append(prev)
+    selected.append(n - 1)
+    return selected
+
+def trend_points(x, y):
+    """Trend entries from epoch timestamps and scores"""
+    return [
+        {'date': datetime.fromtimestamp(t).isoformat(), 'score': round(float(v), 2)}
+        for t, v in zip(x, y)
+    ]
+
+def downsample_trend(x, y, max_points, mode='lttb'):
+    """Reduce trend points to at most max_points, by LTTB or time-bucket averages"""
+    if mode == 'lttb':
+        keep = downsample_lttb(x, y, max_points)
+        return trend_points(x[keep], y[keep])
+    
+    # Equal-width time buckets, empty buckets dropped
+    edges = np.linspace(x[0], x[-1], max_points + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, max_points - 1)
+    counts = np.bincount(bucket, minlength=max_points)
+    mean_x = np.bincount(bucket, weights=x, minlength=max_points)
+    mean_y = np.bincount(bucket, weights=y, minlength=max_points)
+    return [
+        {
+            'date': datetime.fromtimestamp(mean_x[b] / counts[b]).isoformat(),
+            'score': round(mean_y[b] / counts[b], 2),
+            'count': int(counts[b])
+        }
+        for b in np.flatnonzero(counts)
+    ]
+
 # ============================================
 # API ROUTES - AUTH
 # ============================================
@@ -312,24 +634,34 @@ def register():
         name = data.get('name', '').strip()
         email = data.get('email', '').strip().lower()
         password = data.get('password', '')
+        tenant = data.get('tenant')
         
         if not name or not email or not password:
             return jsonify({'error': 'All fields are required'}), 400
+        if tenant is not None and not valid_tenant(tenant):
+            return jsonify({'error': 'Invalid tenant id'}), 400
         
-        if email in [u['email'] for u in users_db.values()]:
+        # Claim the email before creating the user so concurrent sign-ups cannot both pass
+        user_id = str(uuid.uuid4())
+        if not users_by_email.insert_if_absent(email, user_id):
             return jsonify({'error': 'Email already registered'}), 400
         
-        user_id = str(uuid.uuid4())
-        users_db[user_id] = {
+        user = {
             'id': user_id,
             'name': name,
             'email': email,
             'password': hash_password(password),
             'created_at': datetime.now().isoformat()
         }
+        if tenant:
+            user['tenant'] = tenant
+        try:
+            store_log.record(['user', user], key=user['id'])
+        except Exception:
+            users_by_email.pop(email)
+            raise
         
-        token = generate_token()
-        sessions_db[token] = user_id
+        token = generate_token(user)
         
         return jsonify({
             'message': 'Registration successful',
@@ -352,13 +684,13 @@ def login():
         email = data.get('email', '').strip().lower()
         password = data.get('password', '')
         
-        user = next((u for u in users_db.values() if u['email'] == email), None)
+        user_id = users_by_email.get(email)
+        user = users_db.get(user_id) if user_id else None
         
         if not user or user['password'] != hash_password(password):
             return jsonify({'error': 'Invalid email or password'}), 401
         
-        token = generate_token()
-        sessions_db[token] = user['id']
+        token = generate_token(user)
         
         return jsonify({
             'message': 'Login successful',
@@ -373,6 +705,18 @@ def login():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    """Revoke the current token"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    claims = verify_token(token)
+    
+    if not claims:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    store_log.record(['revoke', claims['jti'], claims['exp']], key=claims['jti'])
+    return jsonify({'message': 'Logged out'}), 200
+
 @app.route('/api/profile', methods=['GET'])
 def get_profile():
     """Get user profile"""
@@ -382,14 +726,94 @@ def get_profile():
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
     
+    return jsonify({'user': profile_payload(user)}), 200
+
+def profile_payload(user):
+    return {
+        'id': user['id'],
+        'name': user['name'],
+        'email': user['email'],
+        'created_at': user['created_at']
+    }
+
+# ============================================
+# API ROUTES - RESUME
+# ============================================
+@app.route('/api/resume', methods=['POST'])
+def upload_resume():
+    """
+    Upload a resume (.txt, .docx or text-based .pdf) for feature extraction
+    Accepts multipart form data (field 'resume') or a raw body with ?filename=
+    Returns a job id to poll at /api/resume/<job_id>
+    """
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    if request.content_length and request.content_length > resume_jobs.max_bytes:
+        return jsonify({'error': f'File exceeds {resume_jobs.max_bytes // (1024 * 1024)}MB limit'}), 413
+    
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('resume')
+        if upload is None:
+            return jsonify({'error': 'Missing file field: resume'}), 400
+        filename, stream = upload.filename or '', upload.stream
+    else:
+        filename, stream = request.args.get('filename', ''), request.stream
+    
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        return jsonify({'error': f'Unsupported file type. Upload one of: {", ".join(sorted(SUPPORTED_EXTENSIONS))}'}), 415
+    
+    path = resume_jobs.upload_path(extension)
+    try:
+        with tracer.stage('upload'):
+            size = save_stream(stream, path, resume_jobs.max_bytes)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 413
+    
+    try:
+        job_id = resume_jobs.submit(user['id'], path, os.path.basename(filename), extension, size)
+    except ResumeQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '2'}
+    
     return jsonify({
-        'user': {
-            'id': user['id'],
-            'name': user['name'],
-            'email': user['email'],
-            'created_at': user['created_at']
-        }
-    }), 200
+        'message': 'Resume received',
+        'job_id': job_id,
+        'status_url': f'/api/resume/{job_id}'
+    }), 202
+
+@app.route('/api/resume/<job_id>', methods=['GET'])
+def get_resume_job(job_id):
+    """Status of a resume job; once done, the extracted features and skills"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    job = resume_jobs.get(job_id, user['id'])
+    if job is None:
+        return jsonify({'error': 'Resume job not found'}), 404
+    
+    response = {key: job[key] for key in ('id', 'status', 'filename', 'size') if key in job}
+    if job['status'] == 'done':
+        features = resume_features(job)
+        response.update({
+            'features': features,
+            'skills': job['skills'],
+            'missing_fields': [f for f in FEATURE_NAMES if f not in features]
+        })
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    return jsonify({'data': response}), 200
+
+def resume_features(job):
+    """Extracted features clipped to each feature's scale"""
+    scales = scoring_rules.scales()
+    return {f: type(v)(min(v, scales[f])) for f, v in job['features'].items()}
 
 # ============================================
 # API ROUTES - PREDICTION
@@ -448,24 +872,109 @@ def generate_ai_recommendations(data, skill_gaps, readiness_score):
     
     return recommendations[:6]  # Return top 6 recommendations
 
-def get_placement_category(probability, readiness_score):
+def get_placement_category(scoring):
     """Determine placement category based on probability and readiness"""
-    combined_score = (probability * 0.6) + (readiness_score * 0.4)
-    
-    if combined_score >= 75:
-        return "Tier 1 Companies (Google, Microsoft, Amazon)"
-    elif combined_score >= 60:
-        return "Tier 2 Companies (Service-based & Mid-size Product)"
-    elif combined_score >= 45:
-        return "Tier 3 Companies (Startups & Local Companies)"
-    else:
-        return "Need Significant Improvement"
+    return scoring_rules.level('placement_category', scoring)['label']
+
+def explain_contributions(features_scaled, model):
+    """
+    Each feature's contribution to the logit (coef x scaled value)
+    Works on one row or a whole batch in a single vectorized operation;
+    the logit is the model intercept plus the row sum
+    """
+    return np.asarray(features_scaled) * model.coef_[0]
+
+def format_explanation(contributions, model):
+    """Explanation payload for one row of contributions"""
+    order = np.argsort(-contributions, kind='stable')
+    return {
+        'baseline_logit': round(float(model.intercept_[0]), 4),
+        'contributions': {f: round(float(c), 4) for f, c in zip(FEATURE_NAMES, contributions)},
+        'ranked': [FEATURE_LABELS[FEATURE_NAMES[i]] for i in order]
+    }
+
+def normalize_profile(data):
+    """Cast the model features the way the model sees them (cgpa float, the rest int)"""
+    return {
+        'cgpa': float(data['cgpa']),
+        'dsa_score': int(data['dsa_score']),
+        'projects': int(data['projects']),
+        'communication': int(data['communication']),
+        'internships': int(data['internships'])
+    }
+
+def profile_error(profile):
+    """Error message for the first feature outside FEATURE_RANGES, else None"""
+    for feature in FEATURE_NAMES:
+        low, high = FEATURE_RANGES[feature]
+        if not low <= profile[feature] <= high:
+            return f'{feature} must be between {low} and {high}'
+    return None
+
+def build_prediction(data, bundle):
+    """
+    Prediction and analysis for a normalized profile and a tenant's model bundle
+    Depends only on those two, so identical concurrent requests can share it
+    """
+    # Prepare features
+    features = np.array([[data[f] for f in FEATURE_NAMES]])
+    
+    # Scale features
+    features_scaled = bundle.scaler.transform(features)
+    
+    # Predict
+    probability = bundle.model.predict_proba(features_scaled)[0][1]
+    placement_probability = round(float(probability) * 100, 2)
+    contributions = explain_contributions(features_scaled, bundle.model)[0]
+    scoring = score_profile(data, placement_probability)
+    
+    # Calculate readiness score
+    readiness_score = calculate_readiness_score(data, scoring)
+    
+    # Get recommendation level
+    recommendation = get_recommendation_level(scoring)
+    
+    # Analyze skill gaps - updated to use new return values
+    skill_gaps, scores, ideal_scores, skill_gaps_list = analyze_skill_gaps(data, scoring)
+    
+    # Generate roadmap
+    roadmap = generate_roadmap(skill_gaps)
+    
+    # Generate AI recommendations
+    ai_recommendations = generate_ai_recommendations(data, skill_gaps, readiness_score)
+    
+    # Get placement category
+    placement_category = get_placement_category(scoring)
+    
+    # Weakest and strongest skills are the features that lower/raise the model's logit the most
+    weakest = FEATURE_NAMES[int(np.argmin(contributions))]
+    strongest = FEATURE_NAMES[int(np.argmax(contributions))]
+    
+    return {
+        'model': bundle.name,
+        'placement_probability': placement_probability,
+        'readiness_score': readiness_score,
+        'recommendation_level': recommendation,
+        'skill_analysis': {
+            'scores': scores,
+            'ideal_scores': ideal_scores,
+            'skill_gaps': skill_gaps_list
+        },
+        'weakest_skill': FEATURE_LABELS.get(weakest, weakest),
+        'strongest_skill': FEATURE_LABELS.get(strongest, strongest),
+        'placement_category': placement_category,
+        'explanation': format_explanation(contributions, bundle.model),
+        'ai_recommendations': ai_recommendations,
+        'roadmap_tasks': roadmap
+    }
 
 @app.route('/api/predict', methods=['POST'])
+@admission.guard(admission_key)
 def predict():
     """Make placement prediction"""
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
-    user = get_user_by_token(token)
+    with tracer.stage('auth'):
+        user = get_user_by_token(token)
     
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
@@ -473,131 +982,466 @@ def predict():
     try:
         data = request.get_json()
         
+        # Fill fields the client left out from a finished resume job
+        if data.get('resume_job_id'):
+            job = resume_jobs.get(data['resume_job_id'], user['id'])
+            if job is None or job['status'] != 'done':
+                return jsonify({'error': 'Resume job not found or not finished'}), 400
+            data = {**resume_features(job), **{k: v for k, v in data.items() if k != 'resume_job_id'}}
+        
         # Validate input
         required = ['cgpa', 'dsa_score', 'projects', 'communication', 'internships']
         for field in required:
             if field not in data:
                 return jsonify({'error': f'Missing field: {field}'}), 400
         
-        # Prepare features
-        features = np.array([[
-            float(data['cgpa']),
-            int(data['dsa_score']),
-            int(data['projects']),
-            int(data['communication']),
-            int(data['internships'])
-        ]])
-        
-        # Scale features
-        features_scaled = scaler.transform(features)
+        try:
+            profile = normalize_profile(data)
+        except (TypeError, ValueError, OverflowError):
+            return jsonify({'error': 'Profile fields must be numbers'}), 400
+        error = profile_error(profile)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Predict
-        probability = model.predict_proba(features_scaled)[0][1]
-        placement_probability = round(probability * 100, 2)
-        
-        # Calculate readiness score
-        readiness_score = calculate_readiness_score(data)
-        
-        # Get recommendation level
-        recommendation = get_recommendation_level(readiness_score)
-        
-        # Analyze skill gaps - updated to use new return values
-        skill_gaps, scores, ideal_scores, skill_gaps_list = analyze_skill_gaps(data)
-        
-        # Generate roadmap
-        roadmap = generate_roadmap(skill_gaps)
-        
-        # Generate AI recommendations
-        ai_recommendations = generate_ai_recommendations(data, skill_gaps, readiness_score)
-        
-        # Get placement category
-        placement_category = get_placement_category(placement_probability, readiness_score)
-        
-        # Find weakest and strongest skills
-        sorted_skills = sorted(skill_gaps.items(), key=lambda x: x[1]['score'])
-        weakest = sorted_skills[0][0]
-        strongest = sorted_skills[-1][0]
+        # Identical profiles in flight at the same time are computed once
+        with tracer.stage('drift'):
+            drift_monitor.observe(profile)
+        with tracer.stage('model'):
+            bundle = model_registry.get(tenant_for(user))
+        key = (bundle.name,) + tuple(profile[f] for f in FEATURE_NAMES)
+        with tracer.stage('predict'):
+            result = coalescer.do(key, lambda: build_prediction(profile, bundle))
+        placement_probability = result['placement_probability']
+        readiness_score = result['readiness_score']
         
         # Save prediction
         prediction_id = str(uuid.uuid4())
         prediction_record = {
             'id': prediction_id,
             'user_id': user['id'],
-            'data': data,
+            'data': profile,
             'placement_probability': placement_probability,
             'readiness_score': readiness_score,
+            'model_version': bundle.version,
             'created_at': datetime.now().isoformat()
         }
-        predictions_db.append(prediction_record)
+        with tracer.stage('persist'):
+            prediction_writer.put(['prediction', prediction_record])
         
         return jsonify({
             'status': 'success',
             'prediction_id': prediction_id,
-            'placement_probability': placement_probability,
-            'readiness_score': readiness_score,
-            'recommendation_level': recommendation,
-            'skill_analysis': {
-                'scores': scores,
-                'ideal_scores': ideal_scores,
-                'skill_gaps': skill_gaps_list
-            },
-            'weakest_skill': FEATURE_LABELS.get(weakest, weakest),
-            'strongest_skill': FEATURE_LABELS.get(strongest, strongest),
-            'placement_category': placement_category,
-            'ai_recommendations': ai_recommendations,
-            'roadmap_tasks': roadmap,
+            **result,
             'saved_to_history': True
         }), 200
         
+    except QueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    """Get prediction history"""
+    """
+    Get prediction history
+    Optional query param: since (cursor from an earlier response; only newer predictions are returned)
+    Supports If-None-Match: returns 304 when nothing changed
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = get_user_by_token(token)
     
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    user_predictions = [p for p in predictions_db if p['user_id'] == user['id']]
+    etag = user_etag(user['id'])
+    if not_modified(etag):
+        return with_etag(Response(status=304), etag)
     
-    return jsonify({
-        'data': user_predictions
-    }), 200
+    rows = predictions_db.rows_for_user(user['id'])
+    start, delta = since_cursor(request.args.get('since', type=int), len(rows))
+    
+    return with_etag(jsonify({
+        'data': predictions_db.records(rows[start:]),
+        'cursor': len(rows),
+        'delta': delta
+    }), etag), 200
+
+@app.route('/api/predictions/<prediction_id>/outcome', methods=['POST'])
+def record_outcome(prediction_id):
+    """
+    Record the actual placement outcome of a stored prediction
+    Body: {placed: true|false}. Allowed for the prediction's owner, or for
+    placement officers holding the admin token (any prediction)
+    """
+    admin = is_admin()
+    user = None
+    if not admin:
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user = get_user_by_token(token)
+        if not user:
+            return jsonify({'error': 'Unauthorized'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    placed = data.get('placed')
+    if not isinstance(placed, bool):
+        return jsonify({'error': 'placed must be true or false'}), 400
+    
+    rows = None if admin else predictions_db.rows_for_user(user['id'])
+    row = predictions_db.find(prediction_id, rows)
+    if row is None:
+        return jsonify({'error': 'Prediction not found'}), 404
+    
+    # Repeating the current outcome changes nothing, so it is not logged again
+    outcome = predictions_db.column('outcome')[row]
+    if outcome != (OUTCOME_PLACED if placed else OUTCOME_NOT_PLACED):
+        store_log.record(['outcome', row, placed])
+    return jsonify({'message': 'Outcome recorded', 'data': predictions_db.record(row)}), 200
+
+EXPORT_PAGE_SIZE = 500
+EXPORT_COLUMNS = ['id', 'created_at'] + FEATURE_NAMES + ['placement_probability', 'readiness_score']
+
+def iter_prediction_pages(user_id, page_size=EXPORT_PAGE_SIZE):
+    """Yield the user's predictions a page at a time"""
+    rows = predictions_db.rows_for_user(user_id)
+    for start in range(0, len(rows), page_size):
+        yield predictions_db.records(rows[start:start + page_size])
+
+def export_rows(records):
+    """Flatten prediction records into export rows"""
+    for p in records:
+        row = {'id': p['id'], 'created_at': p['created_at']}
+        row.update({f: p['data'].get(f) for f in FEATURE_NAMES})
+        row['placement_probability'] = p['placement_probability']
+        row['readiness_score'] = p['readiness_score']
+        yield row
+
+def generate_csv_export(user_id):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for page in iter_prediction_pages(user_id):
+        writer.writerows(export_rows(page))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def generate_ndjson_export(user_id):
+    for page in iter_prediction_pages(user_id):
+        yield ''.join(json.dumps(row) + '\n' for row in export_rows(page))
+
+def gzip_stream(chunks):
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+@app.route('/api/history/export', methods=['GET'])
+def export_history():
+    """
+    Stream prediction history as a file download
+    Query params: format ('csv' or 'ndjson'), compress ('gzip' for a .gz file)
+    """
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    export_format = request.args.get('format', 'csv')
+    compress = request.args.get('compress')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'error': f'Unknown format: {export_format}'}), 400
+    if compress not in (None, 'gzip'):
+        return jsonify({'error': f'Unknown compression: {compress}'}), 400
+    
+    if export_format == 'csv':
+        body, mimetype = generate_csv_export(user['id']), 'text/csv'
+    else:
+        body, mimetype = generate_ndjson_export(user['id']), 'application/x-ndjson'
+    
+    filename = f'placement_history.{export_format}'
+    if compress == 'gzip':
+        body, mimetype, filename = gzip_stream(body), 'application/gzip', filename + '.gz'
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 @app.route('/api/analytics', methods=['GET'])
 def get_analytics():
-    """Get user analytics"""
+    """
+    Get user analytics
+    Optional query params: max_points (downsample the trend), mode ('lttb' or 'mean'),
+    since (cursor from an earlier response; the trend then only holds newer points)
+    Supports If-None-Match: returns 304 when nothing changed
+    """
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     user = get_user_by_token(token)
     
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    user_predictions = [p for p in predictions_db if p['user_id'] == user['id']]
+    max_points = request.args.get('max_points', type=int)
+    mode = request.args.get('mode', 'lttb')
+    since = request.args.get('since', type=int)
+    if max_points is not None and max_points < 3:
+        return jsonify({'error': 'max_points must be at least 3'}), 400
+    if mode not in ('lttb', 'mean'):
+        return jsonify({'error': f'Unknown mode: {mode}'}), 400
+    if max_points is not None and since is not None:
+        # A downsampled delta would not line up with the points the client already has
+        return jsonify({'error': 'since cannot be combined with max_points'}), 400
     
-    if not user_predictions:
-        return jsonify({
-            'data': {
-                'total_predictions': 0,
-                'average_score': 0,
-                'trend': []
-            }
-        }), 200
+    etag = user_etag(user['id'])
+    if not_modified(etag):
+        return with_etag(Response(status=304), etag)
+    
+    return with_etag(jsonify({'data': analytics_payload(user['id'], max_points, mode, since)}), etag), 200
+
+def analytics_payload(user_id, max_points=None, mode='lttb', since=None):
+    """Prediction count, average readiness and the trend (downsampled, or only points after since)"""
+    rows = predictions_db.rows_for_user(user_id)
+    start, delta = since_cursor(since, len(rows))
     
-    avg_score = sum(p['readiness_score'] for p in user_predictions) / len(user_predictions)
-    trend = [{'date': p['created_at'], 'score': p['readiness_score']} for p in user_predictions]
+    if len(rows) == 0:
+        return {
+            'total_predictions': 0,
+            'average_score': 0,
+            'trend': [],
+            'cursor': 0,
+            'delta': delta
+        }
+    
+    with tracer.stage('trend'):
+        x = predictions_db.column('created_at')[rows]
+        y = predictions_db.column('readiness_score')[rows].astype(np.float64)
+        avg_score = float(y.mean())
+        if max_points is not None and len(rows) > max_points:
+            trend = downsample_trend(x, y, max_points, mode)
+        else:
+            trend = trend_points(x[start:], y[start:])
+    
+    return {
+        'total_predictions': len(rows),
+        'average_score': round(avg_score, 2),
+        'trend': trend,
+        'downsampled': len(trend) < len(rows) - start,
+        'cursor': len(rows),
+        'delta': delta
+    }
+
+# ============================================
+# API ROUTES - DASHBOARD
+# ============================================
+# Trend points in the dashboard payload (matches the History page chart)
+DASHBOARD_TREND_POINTS = 200
+
+def dashboard_body(user):
+    """
+    Serialized profile + history + analytics for a user
+    Built on the first read after one of the user's writes and reused until
+    the next, so repeat visits skip the store scans and JSON encoding
+    """
+    user_id = user['id']
+    version = user_versions.get(user_id, 0)
+    cached = dashboard_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    body = app.json.dumps({
+        'data': {
+            'user': profile_payload(user),
+            'history': predictions_db.user_records(user_id),
+            'analytics': analytics_payload(user_id, DASHBOARD_TREND_POINTS)
+        }
+    })
+    # A write racing this build bumps the version, so the entry is rebuilt on the next read
+    dashboard_cache.put(user_id, (version, body), len(body))
+    return body
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """Profile, prediction history and analytics in one response"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    with tracer.stage('auth'):
+        user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    etag = user_etag(user['id'])
+    if not_modified(etag):
+        return with_etag(Response(status=304), etag)
+    
+    with tracer.stage('dashboard'):
+        body = dashboard_body(user)
+    return with_etag(Response(body, mimetype='application/json'), etag)
+
+# ============================================
+# API ROUTES - COHORT
+# ============================================
+@app.route('/api/cohort/percentile', methods=['GET'])
+def get_cohort_percentile():
+    """Get the user's latest readiness and probability percentile among all predictions"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    percentiles = cohort_index.percentiles(user['id'])
+    if percentiles is None:
+        return jsonify({'error': 'No predictions yet'}), 404
+    
+    return jsonify({
+        'data': {
+            'total_predictions': cohort_index.total,
+            **percentiles
+        }
+    }), 200
+
+@app.route('/api/cohort/leaderboard', methods=['GET'])
+def get_cohort_leaderboard():
+    """Get the top-k users by their best score"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user = get_user_by_token(token)
+    
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    metric = request.args.get('metric', 'readiness_score')
+    if metric not in COHORT_METRICS:
+        return jsonify({'error': f'Unknown metric: {metric}'}), 400
+    
+    k = min(max(request.args.get('k', 10, type=int), 1), LEADERBOARD_MAX_K)
+    leaders = []
+    for rank, (user_id, value) in enumerate(cohort_index.top_k(metric, k), start=1):
+        leader = users_db.get(user_id, {})
+        leaders.append({
+            'rank': rank,
+            'name': leader.get('name', 'Anonymous'),
+            'value': value,
+            'is_you': user_id == user['id']
+        })
     
     return jsonify({
         'data': {
-            'total_predictions': len(user_predictions),
-            'average_score': round(avg_score, 2),
-            'trend': trend
+            'metric': metric,
+            'leaderboard': leaders
         }
     }), 200
 
+# ============================================
+# API ROUTES - ADMIN
+# ============================================
+# Bulk re-score after a model update (see background_job.py)
+RESCORE_CHUNK_SIZE = int(os.environ.get('RESCORE_CHUNK_SIZE', 5000))
+# Fraction of one core the re-score thread may use
+RESCORE_CPU_SHARE = float(os.environ.get('RESCORE_CPU_SHARE', 0.25))
+
+rescore_lock = threading.Lock()
+rescore_job = None
+
+def rescore_chunk(start, stop):
+    """
+    Re-score rows [start, stop) with the current model of the tenant that scored each row
+    Rows already scored by that model version are skipped; returns the rows changed
+    """
+    rows = slice(start, stop)
+    stored_versions = np.array(predictions_db.model_versions, dtype=object)[predictions_db.column('model')[rows]]
+    tenants = row_tenants(rows)
+    X = np.column_stack([predictions_db.column(f)[rows] for f in FEATURE_NAMES])
+    
+    # One group per tenant; each is re-scored by the bundle now serving that tenant
+    ops = []
+    for tenant in set(tenants):
+        bundle = model_registry.get(tenant)
+        mask = np.equal(tenants, tenant) & (stored_versions != bundle.version)
+        if not mask.any():
+            continue
+        probability = score_matrix(bundle.table, X[mask])[0]
+        ops.append(['rescore', (np.flatnonzero(mask) + start).tolist(),
+                    np.round(probability * 100, 2).tolist(), bundle.version])
+    if ops:
+        store_log.record_many(ops)
+    return sum(len(op[1]) for op in ops)
+
+def finish_rescore(job):
+    # Percentiles and leaderboards include placement_probability
+    if job.changed:
+        store_log.record(['cohort_rebuild'])
+
+@app.route('/api/admin/rescore', methods=['POST'])
+@admin_required
+def start_rescore():
+    """
+    Start re-scoring every stored prediction with the current model for its user
+    Optional body: chunk_size, cpu_share (0-1]
+    """
+    global rescore_job
+    if model is None:
+        return jsonify({'error': 'Model not loaded'}), 503
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        chunk_size = int(data.get('chunk_size', RESCORE_CHUNK_SIZE))
+        cpu_share = float(data.get('cpu_share', RESCORE_CPU_SHARE))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'chunk_size and cpu_share must be numbers'}), 400
+    if chunk_size < 1 or not 0 < cpu_share <= 1:
+        return jsonify({'error': 'chunk_size must be positive and cpu_share in (0, 1]'}), 400
+    
+    with rescore_lock:
+        if rescore_job is not None and rescore_job.running:
+            return jsonify({'error': 'A re-score job is already running', 'data': rescore_job.progress()}), 409
+        # Queued predictions are scored by the current model already, but flushing
+        # them first makes the job's row count cover everything accepted so far
+        prediction_writer.flush(timeout=5)
+        rescore_job = BackgroundJob(
+            'rescore', len(predictions_db), rescore_chunk, finish_rescore,
+            chunk_size=chunk_size, cpu_share=cpu_share,
+            params={'default_model_version': model_registry.default.version}
+        ).start()
+    return jsonify({'data': rescore_job.progress()}), 202
+
+@app.route('/api/admin/rescore', methods=['GET'])
+@admin_required
+def get_rescore():
+    """Progress of the latest re-score job"""
+    if rescore_job is None:
+        return jsonify({'error': 'No re-score job has run'}), 404
+    return jsonify({'data': rescore_job.progress()}), 200
+
+@app.route('/api/admin/rescore/cancel', methods=['POST'])
+@admin_required
+def cancel_rescore():
+    """Stop the running re-score job after its current chunk"""
+    if rescore_job is None:
+        return jsonify({'error': 'No re-score job has run'}), 404
+    rescore_job.cancel()
+    return jsonify({'data': rescore_job.progress()}), 200
+
+@app.route('/api/admin/model', methods=['GET'])
+@admin_required
+def get_model_status():
+    """Live default model version and the online update history"""
+    return jsonify({'data': online_learner.status()}), 200
+
+@app.route('/api/admin/model/update', methods=['POST'])
+@admin_required
+def update_model():
+    """Fold the outcomes reported so far into the model now instead of waiting for the next cycle"""
+    if model is None:
+        return jsonify({'error': 'Model not loaded'}), 503
+    return jsonify({'data': online_learner.update(force=True)}), 200
+
 # ============================================
 # HEALTH CHECK
 # ============================================
@@ -607,6 +1451,7 @@ def health():
     return jsonify({
         'status': 'healthy',
         'model_loaded': model is not None,
+        'scoring_rules_version': scoring_rules.version,
         'timestamp': datetime.now().isoformat()
     }), 200
 
@@ -616,9 +1461,45 @@ def api_health():
     return jsonify({
         'status': 'healthy',
         'model_loaded': model is not None,
+        'scoring_rules_version': scoring_rules.version,
         'timestamp': datetime.now().isoformat()
     }), 200
 
+@app.route('/api/drift')
+def api_drift():
+    """Compare live input distributions with the training data (PSI / KS per feature)"""
+    return jsonify({'data': drift_monitor.report()}), 200
+
+@app.route('/api/metrics')
+def api_metrics():
+    """Serving counters"""
+    return jsonify({
+        'admission': admission.stats(),
+        'coalescing': coalescer.stats(),
+        'store': store_log.stats,
+        'write_behind': prediction_writer.stats(),
+        'models': model_registry.stats(),
+        'resume': resume_jobs.stats(),
+        'dashboard_cache': dashboard_cache.stats()
+    }), 200
+
+@app.route('/debug/slow')
+@admin_required
+def debug_slow():
+    """
+    Slowest requests since start and the most recent ones, with stage timings
+    Query: limit (default 20), route (e.g. /api/predict)
+    """
+    limit = max(1, min(request.args.get('limit', 20, type=int), tracer.capacity))
+    return jsonify({'data': tracer.report(limit, request.args.get('route'))}), 200
+
+@app.route('/debug/slow/reset', methods=['POST'])
+@admin_required
+def debug_slow_reset():
+    """Forget the traced requests"""
+    tracer.reset()
+    return jsonify({'message': 'Trace buffers cleared'}), 200
+
 # ============================================
 # SERVE REACT FRONTEND
 # ============================================
@@ -0,0 +1,147 @@
+# ============================================
+# Write-Behind Queue
+# Moves persistence off the request path
+# ============================================
+# Requests put() items into a bounded queue and return immediately; one
+# background thread drains it and hands each batch to a sink function (for
+# unified_app.py, DurableLog.record_many, which skips an item that fails
+# without losing the rest of its batch). When the queue is full, put()
+# blocks for up to put_timeout and then raises QueueFull so the caller can
+# shed load instead of buffering without bound.
+
+import collections
+import threading
+import time
+
+
+class QueueFull(Exception):
+    """Raised when the write-behind queue stays full for put_timeout seconds"""
+
+
+class WriteBehindQueue:
+    """Bounded queue drained in batches by a background thread"""
+
+    def __init__(self, sink, max_depth=10000, batch_size=500, max_wait=0.01,
+                 put_timeout=0.5, name='write-behind'):
+        self.sink = sink
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.put_timeout = put_timeout
+
+        self.items = collections.deque()
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.drained = threading.Condition(self.lock)
+        self.in_flight = 0
+        self.closed = False
+
+        self.counters = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'rejected': 0,
+            'blocked_puts': 0,
+            'errors': 0
+        }
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.flush_seconds_last = 0.0
+        self.peak_depth = 0
+
+        self.worker = threading.Thread(target=self._drain_loop, name=name, daemon=True)
+        self.worker.start()
+
+    def put(self, item):
+        """Queue an item for writing; blocks while full, raises QueueFull on timeout"""
+        with self.lock:
+            if self.closed:
+                raise RuntimeError('write-behind queue is closed')
+            if len(self.items) >= self.max_depth:
+                self.counters['blocked_puts'] += 1
+                deadline = time.monotonic() + self.put_timeout
+                while len(self.items) >= self.max_depth and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['rejected'] += 1
+                        raise QueueFull(f'Write queue full ({self.max_depth} pending writes)')
+                    self.not_full.wait(remaining)
+                if self.closed:
+                    raise RuntimeError('write-behind queue is closed')
+            self.items.append(item)
+            self.counters['enqueued'] += 1
+            self.peak_depth = max(self.peak_depth, len(self.items))
+            self.not_empty.notify()
+
+    def _drain_loop(self):
+        while True:
+            with self.lock:
+                while not self.items and not self.closed:
+                    self.not_empty.wait()
+                if not self.items and self.closed:
+                    return
+                # Give a burst a moment to accumulate so it is written as one batch
+                deadline = time.monotonic() + self.max_wait
+                while len(self.items) < self.batch_size and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.not_empty.wait(remaining)
+                batch = [self.items.popleft() for _ in range(min(self.batch_size, len(self.items)))]
+                self.in_flight = len(batch)
+                self.not_full.notify_all()
+
+            started = time.perf_counter()
+            try:
+                # A sink may return one result per item; exceptions mark items it skipped
+                results = self.sink(batch) or ()
+                failed = sum(isinstance(r, Exception) for r in results)
+            except Exception as e:
+                print(f'❌ Write-behind batch of {len(batch)} failed: {e}')
+                failed = len(batch)
+            elapsed = time.perf_counter() - started
+
+            with self.lock:
+                self.in_flight = 0
+                self.counters['batches'] += 1
+                self.counters['errors'] += failed
+                self.counters['written'] += len(batch) - failed
+                self.flush_seconds_total += elapsed
+                self.flush_seconds_last = elapsed
+                self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+                self.drained.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far has been handed to the sink"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            while self.items or self.in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.drained.wait(remaining)
+        return True
+
+    def close(self, timeout=30):
+        """Stop accepting writes, drain what is queued and stop the worker"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+        self.worker.join(timeout)
+
+    def stats(self):
+        with self.lock:
+            batches = self.counters['batches']
+            return dict(
+                self.counters,
+                depth=len(self.items) + self.in_flight,
+                max_depth=self.max_depth,
+                peak_depth=self.peak_depth,
+                flush_ms_avg=round(self.flush_seconds_total / batches * 1000, 3) if batches else 0.0,
+                flush_ms_last=round(self.flush_seconds_last * 1000, 3),
+                flush_ms_max=round(self.flush_seconds_max * 1000, 3)
+            )